@@ -8,6 +8,7 @@ from .document_parser import DocumentParser
 from .tools import create_all_tools
 from .models import AIModelManager
 from .knowledge import KnowledgeBaseManager
+from .knowledge.vector_store_manager import stable_document_order
 from .orchestration import OrchestrationManager
 
 from langchain_community.vectorstores import FAISS
@@ -16,6 +17,7 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 import shutil
 
@@ -27,23 +29,32 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 STORAGE_DIR = os.path.join(PROJECT_ROOT, "var", "persistent_storage")
 FAISS_INDEX_PATH = os.path.join(STORAGE_DIR, "vector_store")
 METADATA_PATH = os.path.join(STORAGE_DIR, "metadata.json")
+SUMMARIES_PATH = os.path.join(STORAGE_DIR, "summaries.json")
+
+# Verbose agent traces print synchronously on the request path; keep them
+# opt-in for debugging rather than always on.
+AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "").lower() in ("1", "true", "yes")
 
 
 # --- AGENT SYSTEM PROMPT ---
+# Fully static (no template variables): a byte-identical system prompt across
+# turns and knowledge base changes keeps provider-side prompt caching warm.
 AGENT_SYSTEM_PROMPT = """
 You are an expert AI assistant specializing in Communication Engineering.
 Your primary goal is to assist users by analyzing technical documents and performing relevant calculations.
-You have access to a specialized set of tools to help you. The user has uploaded the following files: {file_list}
+You have access to a specialized set of tools to help you.
 
 Here is your operational guide:
 
-1.  **For General Questions**: Use the `knowledge_base_qa` tool to answer questions about the contents of the documents. This is your primary tool for information retrieval.
+1.  **For File Discovery**: Use the `list_files` tool to see which documents the user has uploaded. Call it whenever you need an exact file name for another tool.
+
+2.  **For General Questions**: Use the `knowledge_base_qa` tool to answer questions about the contents of the documents. This is your primary tool for information retrieval.
 
-2.  **For Summarization**: Use the `summarize_document` tool ONLY when the user explicitly asks for a summary of a specific file.
+3.  **For Summarization**: Use the `summarize_document` tool ONLY when the user explicitly asks for a summary of a specific file.
 
-3.  **For Calculations (e.g., Link Budget)**: This is a multi-step process.
+4.  **For Calculations (e.g., Link Budget)**: This is a multi-step process.
     *   **Step A: Identify Parameters**: First, understand what parameters are needed for the calculation (e.g., for a link budget, you need distance, power, gain, loss, frequency).
-    *   **Step B: Gather Data**: If the user has not provided all parameters, use the `extract_technical_specifications` tool to find the missing information from the uploaded documents. You may need to call this tool multiple times for different documents.
+    *   **Step B: Gather Data**: If the user has not provided all parameters, use the `extract_technical_specifications_batch` tool to find the missing information from all relevant documents in one call. Use the single-file `extract_technical_specifications` tool only for targeted follow-ups on one document.
     *   **Step C: Execute Calculation**: Once you have all the necessary parameters, use the `calculate_link_budget` tool to perform the calculation.
     *   **Step D: Present Results**: Clearly present the final calculated results to the user and, if helpful, list the parameters used to get there.
 
@@ -51,6 +62,16 @@ Always be professional, concise, and when possible, cite the source document for
 """
 
 
+# --- RAG QA PROMPT ---
+# Module-level so rebuilding the chain doesn't re-allocate the template.
+QA_PROMPT = ChatPromptTemplate.from_template("""
+Answer the user's question based only on the following context:
+{context}
+
+Question: {input}
+""")
+
+
 class AgentEngine:
     """
     An AI Agent that can use tools to interact with a knowledge base of documents.
@@ -59,8 +80,10 @@ class AgentEngine:
     def __init__(self, api_key: str):
         if not api_key:
             raise ValueError("OpenAI API key is required.")
-        os.environ["OPENAI_API_KEY"] = api_key
-        
+        # Keep the key per-instance rather than mutating os.environ, so
+        # multiple engines with different keys can coexist in one process
+        self._api_key = api_key
+
         # --- AI Model Management (New Architecture) ---
         self.ai_models = AIModelManager(api_key)
         
@@ -80,11 +103,21 @@ class AgentEngine:
         self.rag_chain = None
         self.agent_executor: AgentExecutor = None
         self.file_names: List[str] = []
+        # Frozen set view of file_names, kept in sync so membership checks
+        # (e.g. upload dedup) don't rebuild a set per call
+        self.file_names_set: frozenset = frozenset()
         self.raw_texts: Dict[str, str] = {}
+        # Monotonic counter bumped on every knowledge base mutation; UI
+        # caches key on it so entries invalidate when content changes
+        self.kb_version: int = 0
         
         # Ensure storage directory exists
         os.makedirs(STORAGE_DIR, exist_ok=True)
-        
+
+        # Summary cache: (content hash, language) -> summary text. Persisted
+        # so identical summarize requests never re-invoke the LLM.
+        self._summary_cache: Dict[str, str] = self._load_summary_cache()
+
         # --- Initialize Tools (Backward Compatibility) ---
         self.tools = create_all_tools(self)
         
@@ -206,52 +239,119 @@ class AgentEngine:
         except Exception as e:
             return f"❌ Error processing query: {str(e)}"
 
+    async def ainvoke(self, query: str, chat_history: List = None) -> str:
+        """Process a user query through the agent asynchronously."""
+        # --- Use new Orchestration Manager (New Architecture) ---
+        if self.orchestration and self.orchestration.is_ready():
+            return await self.orchestration.aprocess_query(query, chat_history)
+
+        # --- Fallback to old behavior (Backward Compatibility) ---
+        if not self.agent_executor:
+            return "❌ Knowledge base not initialized. Please upload documents first."
+
+        try:
+            response = await self.agent_executor.ainvoke({
+                "input": query,
+                "chat_history": chat_history or []
+            })
+            return response["output"]
+        except Exception as e:
+            return f"❌ Error processing query: {str(e)}"
+
+    def get_cached_summary(self, cache_key: str):
+        """Return the cached summary for a (content hash, language) key, or None."""
+        return self._summary_cache.get(cache_key)
+
+    def cache_summary(self, cache_key: str, summary: str):
+        """Store a summary under its (content hash, language) key and persist it."""
+        self._summary_cache[cache_key] = summary
+        self._save_summary_cache()
+
+    def _load_summary_cache(self) -> Dict[str, str]:
+        """Load the persisted summary cache, returning an empty dict on any error."""
+        try:
+            with open(SUMMARIES_PATH, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_summary_cache(self):
+        """Persist the summary cache; failures are non-fatal (cache is advisory)."""
+        try:
+            # Atomic write: a crash mid-save keeps the previous cache intact
+            tmp_path = SUMMARIES_PATH + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._summary_cache, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, SUMMARIES_PATH)
+        except OSError as e:
+            print(f"⚠️ Could not save summary cache: {e}")
+
     def reset_storage(self):
         """Delete all persistent storage."""
         # --- Delegate to new Knowledge Base Manager (New Architecture) ---
         self.knowledge_base.clear_knowledge_base()
+        # The storage wipe removed summaries.json; drop the in-memory copy too
+        self._summary_cache = {}
         
         # --- Reset backward compatibility state variables ---
         self.vectorstore = None
         self.rag_chain = None
         self.agent_executor = None
         self.file_names = []
+        self.file_names_set = frozenset()
         self.raw_texts = {}
+        self.kb_version += 1
 
     # --- Backward Compatibility Methods ---
     
     def _sync_state_from_knowledge_base(self):
         """Sync backward compatibility state variables from knowledge base manager."""
         self.file_names = self.knowledge_base.get_file_names()
+        self.file_names_set = frozenset(self.file_names)
         self.raw_texts = self.knowledge_base.get_all_raw_texts()
         self.vectorstore = self.knowledge_base.vector_store_manager.get_vector_store()
+        self.kb_version += 1
 
     def _build_rag_chain(self):
         """Builds the RAG chain from the current vectorstore."""
         if not self.vectorstore:
             return
-        retriever = self.vectorstore.as_retriever(search_kwargs={"k": 8})
-        qa_prompt = ChatPromptTemplate.from_template("""
-Answer the user's question based only on the following context:
-{context}
-
-Question: {input}
-""")
-        question_answer_chain = create_stuff_documents_chain(self.llm, qa_prompt)
+        retriever = self.vectorstore.as_retriever(
+            search_type="mmr",
+            search_kwargs={"k": 4, "fetch_k": 32, "lambda_mult": 0.5}
+        )
+        # Deterministic context ordering keeps prompt prefixes cacheable.
+        # create_retrieval_chain only extracts x["input"] for BaseRetriever
+        # instances, and piping turns this into a plain Runnable — so the
+        # extraction has to be part of the sequence ourselves.
+        retriever = (
+            RunnableLambda(lambda x: x["input"] if isinstance(x, dict) else x)
+            | retriever
+            | RunnableLambda(stable_document_order)
+        )
+        question_answer_chain = create_stuff_documents_chain(self.llm, QA_PROMPT)
         self.rag_chain = create_retrieval_chain(retriever, question_answer_chain)
 
     def _build_agent(self):
-        """Builds or rebuilds the agent executor with the current file list."""
+        """Builds the agent executor once; the prompt is fully static."""
         if not self.file_names:
             return
-            
-        print("Rebuilding agent with updated file list...")
+
+        if self.agent_executor is not None:
+            # The prompt has no dynamic parts (the agent discovers files via
+            # the list_files tool), so it never needs rebuilding
+            return
+
+        print("Building agent...")
         agent_prompt = ChatPromptTemplate.from_messages([
-            ("system", AGENT_SYSTEM_PROMPT.format(file_list=", ".join(self.file_names))),
+            ("system", AGENT_SYSTEM_PROMPT),
             ("placeholder", "{chat_history}"),
             ("human", "{input}"),
             ("placeholder", "{agent_scratchpad}")
         ])
         agent = create_openai_tools_agent(self.llm, self.tools, agent_prompt)
-        self.agent_executor = AgentExecutor(agent=agent, tools=self.tools, verbose=True)
+        self.agent_executor = AgentExecutor(agent=agent, tools=self.tools, verbose=AGENT_VERBOSE)
         print("Agent is ready.")
@@ -5,6 +5,7 @@ This module handles parsing of various document formats (PDF, DOCX, TXT).
 Restructured as a class for better organization and future extensibility.
 """
 
+import io
 import os
 import tempfile
 import shutil
@@ -71,13 +72,44 @@ class DocumentParser:
             return {"error": f"Error parsing document: {str(e)}"}
 
     @staticmethod
-    def _parse_pdf(file_path: str) -> Dict:
-        """Parse PDF files with fallback OCR support."""
+    def parse_bytes(file_name: str, data: bytes) -> Dict:
+        """
+        Parse a document from in-memory bytes, skipping the disk round-trip.
+
+        Args:
+            file_name: Original filename (used to pick the format)
+            data: Raw file contents
+
+        Returns:
+            Dict with 'content' (str) or 'error' (str)
+        """
+        try:
+            file_extension = os.path.splitext(file_name)[1].lower()
+
+            if file_extension == '.pdf':
+                return DocumentParser._parse_pdf(data, from_bytes=True)
+            elif file_extension == '.docx':
+                # python-docx accepts any file-like object
+                return DocumentParser._parse_docx(io.BytesIO(data))
+            elif file_extension == '.txt':
+                return DocumentParser._parse_txt_bytes(data)
+            else:
+                return {"error": f"Unsupported file format: {file_extension}"}
+
+        except Exception as e:
+            return {"error": f"Error parsing document: {str(e)}"}
+
+    @staticmethod
+    def _parse_pdf(source, from_bytes: bool = False) -> Dict:
+        """Parse PDF files (path or raw bytes) with fallback OCR support."""
         try:
-            doc = fitz.open(file_path)
+            if from_bytes:
+                doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                doc = fitz.open(source)
             text_content = []
             temp_dir = None
-            
+
             for page_num in range(len(doc)):
                 page = doc.load_page(page_num)
                 text = page.get_text()
@@ -98,10 +130,10 @@ class DocumentParser:
                         text_content.append(f"=== Text extracted from images using OCR ===\n{ocr_text}")
             
             doc.close()
-            
-            # Cleanup temp directory
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+
+            # Cleanup temp directory; ignore_errors skips the extra stat call
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
             
             if not text_content:
                 return {"error": "No readable text found in PDF"}
@@ -112,10 +144,10 @@ class DocumentParser:
             return {"error": f"Error parsing PDF: {str(e)}"}
 
     @staticmethod
-    def _parse_docx(file_path: str) -> Dict:
-        """Parse DOCX files with image OCR support."""
+    def _parse_docx(source) -> Dict:
+        """Parse DOCX files (path or file-like object) with image OCR support."""
         try:
-            doc = Document(file_path)
+            doc = Document(source)
             text_content = []
             temp_dir = None
             
@@ -139,10 +171,10 @@ class DocumentParser:
                         except:
                             continue
             
-            # Cleanup temp directory
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            
+            # Cleanup temp directory; ignore_errors skips the extra stat call
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
             if not text_content:
                 return {"error": "No readable text found in DOCX"}
             
@@ -174,6 +206,23 @@ class DocumentParser:
         except Exception as e:
             return {"error": f"Error parsing text file: {str(e)}"}
 
+    @staticmethod
+    def _parse_txt_bytes(data: bytes) -> Dict:
+        """Parse plain text content already held in memory."""
+        try:
+            content = data.decode('utf-8')
+        except UnicodeDecodeError:
+            try:
+                # Try with different encoding
+                content = data.decode('latin-1')
+            except Exception as e:
+                return {"error": f"Error reading text file: {str(e)}"}
+
+        if not content.strip():
+            return {"error": "Text file is empty"}
+
+        return {"content": content}
+
     @staticmethod
     def _extract_text_from_image(image_path: str) -> str:
         """Extract text from image using OCR (Tesseract) or GPT-4o Vision."""
@@ -4,18 +4,21 @@ Knowledge Base Management Package
 This package provides centralized management for knowledge base operations:
 - Document Processor: Document parsing, text splitting, validation
 - Vector Store Manager: FAISS vector storage management
+- Embedding Cache: Persistent content-hash embedding reuse
 - Persistence Manager: Knowledge base state persistence
 - Knowledge Base Manager: Unified knowledge base lifecycle management
 """
 
 from .document_processor import DocumentProcessor
 from .vector_store_manager import VectorStoreManager
+from .embedding_cache import EmbeddingCache
 from .persistence_manager import PersistenceManager
 from .knowledge_base_manager import KnowledgeBaseManager
 
 __all__ = [
     'DocumentProcessor',
     'VectorStoreManager',
+    'EmbeddingCache',
     'PersistenceManager',
     'KnowledgeBaseManager'
 ]
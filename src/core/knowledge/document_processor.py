@@ -8,9 +8,105 @@ Responsible for:
 - Metadata management
 """
 
+import atexit
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Tuple, Dict, Any
 from ..document_parser import DocumentParser
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+
+# Above this many characters, parent chunking skips the recursive splitter
+# (pure-Python separator scanning) for direct token-window slicing.
+LARGE_DOC_CHAR_THRESHOLD = 200_000
+
+# Copy buffer for streaming uploads to disk; bounds memory per file
+# instead of materializing the whole payload a second time.
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Process-lifetime scratch directory for upload batches; allocated once
+# instead of creating and tearing down a directory per batch.
+_upload_tempdir = None
+
+
+def _get_upload_tempdir() -> str:
+    """Lazily create the shared upload scratch directory (removed at exit)."""
+    global _upload_tempdir
+    if _upload_tempdir is None:
+        _upload_tempdir = tempfile.mkdtemp(prefix="aioa_uploads_")
+        atexit.register(shutil.rmtree, _upload_tempdir, ignore_errors=True)
+    return _upload_tempdir
+
+
+def _parse_file(file_path: str) -> Dict[str, Any]:
+    """
+    Parse one document, returning an error dict instead of raising.
+
+    Module-level so it can be shipped to worker processes; a raised
+    exception in a pool would abort the whole batch.
+    """
+    try:
+        return DocumentParser.parse_document(file_path)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@lru_cache(maxsize=None)
+def _token_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """
+    Build (and cache) a token-length text splitter.
+
+    Counting tokens with tiktoken instead of characters keeps chunk sizes
+    uniform across languages and avoids over-long chunks wasting embedding
+    quota. Counts use the chat model's own encoding so chunk budgets line
+    up with the prompt window it actually sees. The cache also avoids
+    rebuilding the BPE encoder per call.
+
+    Args:
+        chunk_size: Maximum chunk size in tokens
+        chunk_overlap: Overlap between chunks in tokens
+
+    Returns:
+        Configured token-aware RecursiveCharacterTextSplitter
+    """
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        model_name="gpt-4o-mini",
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+
+@lru_cache(maxsize=None)
+def _token_encoding():
+    """Cached tiktoken encoding matching the splitters' token counting."""
+    import tiktoken
+    return tiktoken.encoding_for_model("gpt-4o-mini")
+
+
+def _window_split(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """
+    Split text into fixed token windows with overlap.
+
+    One Rust-side encode plus list slicing, instead of the recursive
+    splitter's per-separator Python scan — same token budgets, far less
+    CPU on very large documents. Window boundaries ignore sentence
+    structure, but the overlap keeps context continuous across chunks.
+
+    Args:
+        text: Text to split
+        chunk_size: Window size in tokens
+        chunk_overlap: Tokens shared between consecutive windows
+
+    Returns:
+        List of decoded text chunks
+    """
+    enc = _token_encoding()
+    ids = enc.encode(text, disallowed_special=())
+    step = max(chunk_size - chunk_overlap, 1)
+    return [enc.decode(ids[i:i + chunk_size]) for i in range(0, len(ids), step)]
 
 
 class DocumentProcessor:
@@ -24,6 +120,13 @@ class DocumentProcessor:
     def __init__(self):
         """Initialize the document processor."""
         self.min_chunk_length = 10  # Minimum viable chunk length
+
+        # Parent-child (small-to-big) retrieval configuration (in tokens):
+        # retrieve against small chunks, feed their larger parents to the LLM
+        self.parent_chunk_size = 512
+        self.parent_chunk_overlap = 100
+        self.child_chunk_size = 96
+        self.child_chunk_overlap = 16
     
     def process_uploaded_files(self, uploaded_files: List) -> Tuple[List[Tuple[str, Dict]], List[str]]:
         """
@@ -37,50 +140,139 @@ class DocumentProcessor:
             - docs_for_rag: List of (text_content, metadata) tuples
             - failed_files: List of filenames that couldn't be processed
         """
+        # Materialize once: callers may hand us a dict view, and the list is
+        # iterated several times below
+        uploaded_files = list(uploaded_files)
         docs_for_rag = []
         failed_files = []
-        
-        for file in uploaded_files:
+
+        # Single-file fast path: parse straight from memory — the disk
+        # spill only exists so multi-file batches can parse in parallel
+        # worker processes
+        if len(uploaded_files) == 1:
+            file = uploaded_files[0]
             print(f"📄 Processing: {file.name}")
-            
-            # Save the uploaded file to a temporary location
             try:
-                with open(file.name, "wb") as f:
-                    f.write(file.getvalue())
-                
-                # Parse the document
-                parsed_result = DocumentParser.parse_document(file.name)
-                
+                file.seek(0)
+                parsed_result = DocumentParser.parse_bytes(file.name, file.getvalue())
+            except Exception as e:
+                parsed_result = {"error": str(e)}
+
+            if "error" in parsed_result:
+                print(f"  ❌ Failed to parse {file.name}: {parsed_result['error']}")
+                failed_files.append(file.name)
+            elif not self._is_valid_content(parsed_result["content"]):
+                print(f"  - {file.name} contains no readable text (may be image-only or OCR failed)")
+                failed_files.append(file.name)
+            else:
+                text = parsed_result["content"]
+                print(f"  ✅ Extracted {len(text)} characters from {file.name}")
+                docs_for_rag.append((text, {"source": file.name}))
+
+            return docs_for_rag, failed_files
+
+        # Phase 1: save everything to disk so parsing can run in parallel.
+        # Writes overlap in a thread pool (write() releases the GIL); each
+        # worker reports its error instead of raising so one bad file
+        # doesn't abort the batch. Each batch gets its own subdirectory of
+        # the shared scratch dir so concurrent sessions uploading files
+        # with the same name cannot collide.
+        temp_dir = tempfile.mkdtemp(dir=_get_upload_tempdir())
+
+        def _persist_one(file):
+            try:
+                file.seek(0)
+                with open(os.path.join(temp_dir, file.name), "wb", buffering=0) as f:
+                    if getattr(file, "size", None) and file.size <= UPLOAD_CHUNK_SIZE:
+                        # Small file: one write() of the upload's own
+                        # buffer (getbuffer is a view, not a copy)
+                        f.write(file.getbuffer())
+                    else:
+                        # Stream through a fixed-size buffer rather than
+                        # materializing the payload a second time;
+                        # buffering=0 skips the BufferedWriter's extra
+                        # userland copy since the chunks are already large
+                        shutil.copyfileobj(file, f, length=UPLOAD_CHUNK_SIZE)
+                return None
+            except Exception as e:
+                return str(e)
+
+        if len(uploaded_files) <= 1:
+            save_errors = [_persist_one(file) for file in uploaded_files]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(uploaded_files))) as pool:
+                save_errors = list(pool.map(_persist_one, uploaded_files))
+
+        for file, save_error in zip(uploaded_files, save_errors):
+            print(f"📄 Processing: {file.name}")
+            if save_error is not None:
+                print(f"  ❌ Error saving {file.name}: {save_error}")
+                failed_files.append(file.name)
+
+        # Comprehensions size the lists in one pass instead of growing
+        # them append-by-append
+        saved_files = [
+            file.name
+            for file, save_error in zip(uploaded_files, save_errors)
+            if save_error is None
+        ]
+        saved_paths = [os.path.join(temp_dir, name) for name in saved_files]
+
+        # Phase 2: parse all saved files concurrently
+        try:
+            parsed_results = self._parse_files_parallel(saved_paths)
+
+            # Phase 3: validate results in upload order
+            for file_name, parsed_result in zip(saved_files, parsed_results):
                 if "error" in parsed_result:
-                    print(f"  ❌ Failed to parse {file.name}: {parsed_result['error']}")
-                    failed_files.append(file.name)
+                    print(f"  ❌ Failed to parse {file_name}: {parsed_result['error']}")
+                    failed_files.append(file_name)
                     continue
-                
+
                 text = parsed_result["content"]
-                
-                # Validate content
+
                 if not self._is_valid_content(text):
-                    print(f"  - {file.name} contains no readable text (may be image-only or OCR failed)")
-                    failed_files.append(file.name)
+                    print(f"  - {file_name} contains no readable text (may be image-only or OCR failed)")
+                    failed_files.append(file_name)
                     continue
-                
-                print(f"  ✅ Extracted {len(text)} characters")
-                docs_for_rag.append((text, {"source": file.name}))
-                
-            except Exception as e:
-                print(f"  ❌ Error processing {file.name}: {str(e)}")
-                failed_files.append(file.name)
-            
-            finally:
-                # Clean up temporary file
-                try:
-                    import os
-                    if os.path.exists(file.name):
-                        os.remove(file.name)
-                except:
-                    pass  # Ignore cleanup errors
-        
+
+                print(f"  ✅ Extracted {len(text)} characters from {file_name}")
+                docs_for_rag.append((text, {"source": file_name}))
+
+        finally:
+            # Remove this batch's subdirectory; the shared scratch dir stays
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
         return docs_for_rag, failed_files
+
+    def _parse_files_parallel(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Parse several documents concurrently.
+
+        Parsing is CPU-bound (PyMuPDF/docx extraction), so a process pool
+        gives real parallelism for multi-file uploads; single files skip
+        the pool overhead entirely. Falls back to threads where process
+        pools are unavailable (PyMuPDF releases the GIL during extraction).
+
+        Args:
+            file_paths: Paths of the saved upload files
+
+        Returns:
+            Parse results in the same order as file_paths
+        """
+        if len(file_paths) <= 1:
+            return [_parse_file(path) for path in file_paths]
+
+        # Cap workers: beyond ~8 the per-process spawn cost outweighs the
+        # parallelism gain for typical upload batch sizes
+        max_workers = min(len(file_paths), 8, os.cpu_count() or 1)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(_parse_file, file_paths))
+        except Exception as e:
+            print(f"  Process pool unavailable ({str(e)}), parsing with threads")
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(_parse_file, file_paths))
     
     def _is_valid_content(self, text: str) -> bool:
         """
@@ -114,35 +306,32 @@ class DocumentProcessor:
         Returns:
             Configured RecursiveCharacterTextSplitter
         """
-        # Default configuration
-        chunk_size = 1500
-        overlap = 300
-        
+        # Default configuration (in tokens)
+        chunk_size = 384
+        overlap = 64
+
         # Analyze documents to optimize chunk size if provided
         if docs_for_rag:
             total_length = sum(len(doc[0]) for doc in docs_for_rag)
             avg_doc_length = total_length / len(docs_for_rag) if docs_for_rag else 0
-            
+
             print(f"📊 Document analysis: {len(docs_for_rag)} docs, avg length: {avg_doc_length:.0f} chars")
-            
+
             # Adjust chunk size based on document characteristics
             if avg_doc_length < 2000:
                 # Short documents - smaller chunks
-                chunk_size = 800
-                overlap = 200
+                chunk_size = 192
+                overlap = 32
                 print("🔧 Using smaller chunks for short documents")
             elif avg_doc_length > 10000:
-                # Long documents - larger chunks  
-                chunk_size = 2000
-                overlap = 400
+                # Long documents - larger chunks
+                chunk_size = 512
+                overlap = 96
                 print("🔧 Using larger chunks for long documents")
-            
-        print(f"📏 Text splitting: chunk_size={chunk_size}, overlap={overlap}")
-        
-        return RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size, 
-            chunk_overlap=overlap
-        )
+
+        print(f"📏 Text splitting: chunk_size={chunk_size} tokens, overlap={overlap} tokens")
+
+        return _token_splitter(chunk_size, overlap)
     
     def create_valid_chunks(self, text_splitter: RecursiveCharacterTextSplitter, 
                           docs_for_rag: List) -> List:
@@ -177,6 +366,57 @@ class DocumentProcessor:
         print(f"📝 Created {len(valid_chunks)} valid chunks")
         return valid_chunks
     
+    def create_parent_child_chunks(self, docs_for_rag: List) -> Tuple[List, Dict[str, Any]]:
+        """
+        Create small child chunks for retrieval and larger parent chunks for context.
+
+        Small chunks give better retrieval precision while the larger parents
+        they map back to carry enough surrounding context for generation
+        (small-to-big retrieval).
+
+        Args:
+            docs_for_rag: List of (text, metadata) tuples
+
+        Returns:
+            Tuple of (child_docs, parents) where:
+            - child_docs: List of small Document chunks carrying a parent_id
+            - parents: Dict mapping parent_id to the parent Document
+        """
+        parent_splitter = _token_splitter(self.parent_chunk_size, self.parent_chunk_overlap)
+        child_splitter = _token_splitter(self.child_chunk_size, self.child_chunk_overlap)
+
+        parents = {}
+        child_docs = []
+
+        for text, metadata in docs_for_rag:
+            source = metadata["source"]
+            if len(text) >= LARGE_DOC_CHAR_THRESHOLD:
+                # Very large document: token-window fast path
+                parent_docs = [
+                    Document(page_content=chunk, metadata=dict(metadata))
+                    for chunk in _window_split(
+                        text, self.parent_chunk_size, self.parent_chunk_overlap
+                    )
+                ]
+            else:
+                parent_docs = parent_splitter.create_documents([text], metadatas=[metadata])
+
+            for i, parent in enumerate(parent_docs):
+                # Deterministic ids so the mapping can be rebuilt from raw text
+                parent_id = f"{source}::{i}"
+                parent.metadata = {**parent.metadata, "parent_id": parent_id}
+                parents[parent_id] = parent
+
+                for child in child_splitter.split_documents([parent]):
+                    if len(child.page_content.strip()) > self.min_chunk_length:
+                        child_docs.append(child)
+
+        if not child_docs:
+            raise ValueError("No meaningful content chunks could be created from the documents.")
+
+        print(f"📝 Created {len(child_docs)} child chunks across {len(parents)} parent chunks")
+        return child_docs, parents
+
     def extract_raw_texts(self, uploaded_files: List, docs_for_rag: List) -> Dict[str, str]:
         """
         Extract raw text mapping for files that were successfully processed.
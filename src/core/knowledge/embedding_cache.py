@@ -0,0 +1,94 @@
+"""
+Embedding Cache - Persistent Embedding Reuse
+
+Responsible for:
+- Caching embedding vectors on disk across sessions
+- Keyed by content hash, so re-uploaded or re-chunked identical text
+  never hits the embedding API twice
+"""
+
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache mapping chunk content hashes to embedding vectors.
+
+    Vectors are stored as raw float32 bytes. A single file under the
+    persistent storage directory survives restarts, so re-ingesting a
+    document (e.g. after a delete or a knowledge base rebuild) reuses
+    the previously paid-for embeddings.
+    """
+
+    def __init__(self, db_path: str, namespace: str = ""):
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            namespace: Key prefix, typically the embedding model name, so
+                vectors from different models never collide
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._namespace = namespace.encode("utf-8")
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Fetch cached vectors for the given content hashes.
+
+        Args:
+            hashes: Content hashes to look up
+
+        Returns:
+            Mapping of hash to float32 vector for every cache hit
+        """
+        if not hashes:
+            return {}
+
+        found = {}
+        prefix_len = len(self._namespace)
+        # SQLite caps the number of bound parameters per statement
+        for start in range(0, len(hashes), 500):
+            batch = [self._namespace + digest for digest in hashes[start:start + 500]]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})",
+                batch,
+            )
+            for digest, blob in rows:
+                found[bytes(digest)[prefix_len:]] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, np.ndarray]]) -> None:
+        """
+        Store embedding vectors under their content hashes.
+
+        Args:
+            items: Iterable of (hash, float32 vector) pairs
+        """
+        rows = [
+            (self._namespace + digest, np.asarray(vector, dtype=np.float32).tobytes())
+            for digest, vector in items
+        ]
+        if not rows:
+            return
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)", rows
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -8,10 +8,13 @@ Responsible for:
 - Coordinating between different knowledge base components
 """
 
+import hashlib
+import os
 from typing import List, Dict, Optional, Tuple
 from .document_processor import DocumentProcessor
+from .embedding_cache import EmbeddingCache
 from .vector_store_manager import VectorStoreManager
-from .persistence_manager import PersistenceManager
+from .persistence_manager import LazyTextStore, PersistenceManager
 
 
 class KnowledgeBaseManager:
@@ -35,15 +38,56 @@ class KnowledgeBaseManager:
         
         # Initialize component managers
         self.document_processor = DocumentProcessor()
+        self._embedding_cache_path = os.path.join(storage_dir, "embedding_cache.sqlite3")
+        # Namespace cache keys by model so switching embedding models can
+        # never serve vectors computed by a different one
+        self._embedding_cache_namespace = (
+            ai_model_manager.get_embedding_provider().get_model_info().get("model", "")
+        )
+        self.embedding_cache = EmbeddingCache(
+            self._embedding_cache_path, namespace=self._embedding_cache_namespace
+        )
         self.vector_store_manager = VectorStoreManager(
-            ai_model_manager.get_embedding_provider()
+            ai_model_manager.get_embedding_provider(),
+            embedding_cache=self.embedding_cache
         )
         self.persistence_manager = PersistenceManager(storage_dir)
         
         # State management
         self.file_names: List[str] = []
         self.raw_texts: Dict[str, str] = {}
+        # Content digest -> file name for files already ingested, so
+        # identical bytes under a different name are never re-embedded
+        self.content_digests: Dict[str, str] = {}
         self._is_initialized = False
+
+    @staticmethod
+    def digest_uploaded_file(uploaded_file) -> str:
+        """
+        Compute the content digest of an upload without buffering it whole.
+
+        Args:
+            uploaded_file: File-like object (Streamlit UploadedFile)
+
+        Returns:
+            Hex sha256 digest of the file bytes
+        """
+        hasher = hashlib.sha256()
+        uploaded_file.seek(0)
+        for chunk in iter(lambda: uploaded_file.read(4 * 1024 * 1024), b""):
+            hasher.update(chunk)
+        uploaded_file.seek(0)
+        return hasher.hexdigest()
+
+    def has_content_digest(self, digest: str) -> bool:
+        """Check whether a content digest is already in the knowledge base."""
+        return digest in self.content_digests
+
+    def _record_content_digests(self, uploaded_files: List, failed_files: List[str]) -> None:
+        """Record content digests for every successfully ingested upload."""
+        for file in uploaded_files:
+            if file.name not in failed_files:
+                self.content_digests[self.digest_uploaded_file(file)] = file.name
     
     def create_knowledge_base(self, uploaded_files: List) -> List[str]:
         """
@@ -66,16 +110,18 @@ class KnowledgeBaseManager:
         if not docs_for_rag:
             raise ValueError("❌ No files could be processed successfully. Please check your file formats and content.")
         
-        # Step 2: Create text chunks
-        text_splitter = self.document_processor.get_text_splitter(docs_for_rag)
-        split_docs = self.document_processor.create_valid_chunks(text_splitter, docs_for_rag)
-        
-        # Step 3: Create vector store
+        # Step 2: Create child chunks for retrieval and parent chunks for context
+        split_docs, parents = self.document_processor.create_parent_child_chunks(docs_for_rag)
+
+        # Step 3: Create vector store over the child chunks
         vector_store = self.vector_store_manager.create_vector_store(split_docs)
-        
+        self.vector_store_manager.set_parent_documents(parents, replace=True)
+
         # Step 4: Update state
         self.file_names = [file.name for file in uploaded_files if file.name not in failed_files]
         self.raw_texts = self.document_processor.extract_raw_texts(uploaded_files, docs_for_rag)
+        self.content_digests = {}
+        self._record_content_digests(uploaded_files, failed_files)
         self._is_initialized = True
         
         # Step 5: Save to disk
@@ -107,11 +153,11 @@ class KnowledgeBaseManager:
             return [file.name for file in uploaded_files]
         
         # Step 2: Create chunks for new documents
-        text_splitter = self.document_processor.get_text_splitter(docs_for_rag)
-        split_docs = self.document_processor.create_valid_chunks(text_splitter, docs_for_rag)
-        
+        split_docs, parents = self.document_processor.create_parent_child_chunks(docs_for_rag)
+
         # Step 3: Add to vector store
         self.vector_store_manager.add_documents_to_store(split_docs)
+        self.vector_store_manager.set_parent_documents(parents)
         
         # Step 4: Update state
         new_file_names = [file.name for file in uploaded_files if file.name not in failed_files]
@@ -119,6 +165,7 @@ class KnowledgeBaseManager:
         
         new_raw_texts = self.document_processor.extract_raw_texts(uploaded_files, docs_for_rag)
         self.raw_texts.update(new_raw_texts)
+        self._record_content_digests(uploaded_files, failed_files)
         
         # Step 5: Save updated state
         self.save_knowledge_base()
@@ -149,9 +196,14 @@ class KnowledgeBaseManager:
         
         if success:
             # Update state
+            self.vector_store_manager.remove_parents_for_source(file_name)
             self.file_names.remove(file_name)
             if file_name in self.raw_texts:
                 del self.raw_texts[file_name]
+            self.content_digests = {
+                digest: name for digest, name in self.content_digests.items()
+                if name != file_name
+            }
             
             # Save updated state
             self.save_knowledge_base()
@@ -168,20 +220,55 @@ class KnowledgeBaseManager:
         Returns:
             True if knowledge base was loaded successfully, False otherwise
         """
-        vector_store, file_names, raw_texts = self.persistence_manager.load_knowledge_base(
-            self.ai_model_manager.get_embedding_provider()
-        )
-        
+        vector_store, file_names, raw_texts, source_ids, content_digests = \
+            self.persistence_manager.load_knowledge_base(
+                self.ai_model_manager.get_embedding_provider()
+            )
+
         if vector_store is not None:
             self.vector_store_manager.set_vector_store(vector_store)
+            if source_ids:
+                # Restore the persisted source→ids mapping so deletions never
+                # need to scan (and therefore materialize) the docstore
+                self.vector_store_manager.set_source_id_map(source_ids)
             self.file_names = file_names
             self.raw_texts = raw_texts
+            self.content_digests = content_digests
+            # Parents materialize on first retrieval, not at startup
+            self.vector_store_manager.set_parent_store_loader(self._load_parent_store)
             self._is_initialized = True
-            
+
             print(f"✅ Knowledge base loaded: {len(file_names)} documents")
             return True
-        
+
         return False
+
+    def _load_parent_store(self) -> Dict:
+        """
+        Produce the parent documents for a loaded knowledge base.
+
+        Prefers the store persisted at save time; only knowledge bases
+        saved before parent persistence existed fall back to re-deriving
+        parents from the raw texts (parent chunking is deterministic).
+        """
+        parents = self.persistence_manager.load_parent_store()
+        if parents is not None:
+            return parents
+
+        docs_for_rag = [
+            (text, {"source": file_name})
+            for file_name, text in self.raw_texts.items()
+        ]
+        if not docs_for_rag:
+            return {}
+
+        try:
+            _, parents = self.document_processor.create_parent_child_chunks(docs_for_rag)
+            return parents
+        except ValueError:
+            # No meaningful chunks (e.g. legacy/empty raw texts) — retrieval
+            # falls back to the indexed chunks themselves.
+            return {}
     
     def save_knowledge_base(self) -> None:
         """Save current knowledge base state to disk."""
@@ -189,32 +276,52 @@ class KnowledgeBaseManager:
             print("No knowledge base to save")
             return
         
-        vector_store = self.vector_store_manager.get_vector_store()
-        self.persistence_manager.save_knowledge_base(
-            vector_store, self.file_names, self.raw_texts
-        )
+        # Serialization requires a CPU index; re-promote afterwards if needed
+        was_on_gpu = self.vector_store_manager.demote_index_to_cpu()
+        try:
+            vector_store = self.vector_store_manager.get_vector_store()
+            self.persistence_manager.save_knowledge_base(
+                vector_store, self.file_names, self.raw_texts,
+                source_ids=self.vector_store_manager.get_source_id_map(),
+                content_digests=self.content_digests,
+                parent_store=self.vector_store_manager.get_parent_store()
+            )
+        finally:
+            if was_on_gpu:
+                self.vector_store_manager.promote_index_to_gpu()
     
     def clear_knowledge_base(self) -> None:
         """Clear all knowledge base data."""
+        # Clearing wipes the storage directory; reopen the cache afterwards
+        # so it doesn't keep writing to an unlinked database file
+        self.embedding_cache.close()
         self.persistence_manager.clear_knowledge_base()
+        self.embedding_cache = EmbeddingCache(
+            self._embedding_cache_path, namespace=self._embedding_cache_namespace
+        )
+        self.vector_store_manager.embedding_cache = self.embedding_cache
         self.file_names = []
         self.raw_texts = {}
+        self.content_digests = {}
         self.vector_store_manager.set_vector_store(None)
+        self.vector_store_manager.set_parent_documents({}, replace=True)
         self._is_initialized = False
         
         print("✅ Knowledge base cleared")
     
-    def get_vector_store_retriever(self, search_kwargs: Dict = None):
+    def get_vector_store_retriever(self, search_kwargs: Dict = None,
+                                   search_type: str = "similarity"):
         """
         Get a retriever for the vector store.
-        
+
         Args:
             search_kwargs: Optional search configuration
-            
+            search_type: Retrieval strategy ("similarity" or "mmr")
+
         Returns:
             Vector store retriever for RAG operations
         """
-        return self.vector_store_manager.get_retriever(search_kwargs)
+        return self.vector_store_manager.get_retriever(search_kwargs, search_type)
     
     def search_documents(self, query: str, k: int = 8):
         """
@@ -228,7 +335,20 @@ class KnowledgeBaseManager:
             List of relevant documents
         """
         return self.vector_store_manager.search_similar_documents(query, k)
-    
+
+    def search_documents_batch(self, queries: List[str], k: int = 8):
+        """
+        Search for relevant documents for several queries in one FAISS call.
+
+        Args:
+            queries: List of search queries (e.g. original + rewritten question)
+            k: Number of results to return per query
+
+        Returns:
+            Deduplicated list of relevant documents
+        """
+        return self.vector_store_manager.search_similar_documents_batch(queries, k)
+
     def get_file_names(self) -> List[str]:
         """Get list of all file names in the knowledge base."""
         return self.file_names.copy()
@@ -249,6 +369,17 @@ class KnowledgeBaseManager:
         """Get all raw text contents."""
         return self.raw_texts.copy()
     
+    def _raw_text_size(self) -> int:
+        """
+        Total character count of all raw texts.
+
+        Uses the lazy store's recorded lengths when available, so computing
+        stats never forces every document body to be decompressed.
+        """
+        if isinstance(self.raw_texts, LazyTextStore):
+            return sum(self.raw_texts.text_length(name) for name in self.raw_texts)
+        return sum(len(text) for text in self.raw_texts.values())
+
     def is_initialized(self) -> bool:
         """Check if knowledge base is initialized and ready."""
         return self._is_initialized
@@ -268,7 +399,7 @@ class KnowledgeBaseManager:
                 "current_file_count": len(self.file_names),
                 "current_files": self.file_names,
                 "vector_store_document_count": self.vector_store_manager.get_document_count(),
-                "raw_text_size": sum(len(text) for text in self.raw_texts.values())
+                "raw_text_size": self._raw_text_size()
             })
         else:
             base_info.update({
@@ -8,11 +8,136 @@ Responsible for:
 - State validation and recovery
 """
 
+import hashlib
 import os
 import json
+import pickle
 import shutil
+import zlib
+
+try:
+    import orjson  # Faster metadata serialization when available
+except ImportError:
+    orjson = None
+from collections.abc import MutableMapping
 from typing import Dict, List, Optional, Tuple
+
+import faiss
+
+# Memory-mapped index loading is on by default; FAISS_MMAP=0 forces the
+# standard full read (e.g. on filesystems where mmap performs poorly).
+FAISS_MMAP = os.getenv("FAISS_MMAP", "1").lower() not in ("0", "false", "no")
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+
+class LazyTextStore(MutableMapping):
+    """
+    Dict-like view over raw texts persisted as per-file compressed blobs.
+
+    Texts are decompressed on first access and cached, so loading the
+    knowledge base only reads the small metadata index instead of pulling
+    every document body into memory up front.
+    """
+
+    def __init__(self, texts_dir: str, entries: Dict[str, Dict]):
+        """
+        Args:
+            texts_dir: Directory holding the compressed text blobs
+            entries: Index mapping file name to {"file": blob name, "length": chars}
+        """
+        self._texts_dir = texts_dir
+        self._entries = dict(entries)
+        self._cache: Dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> str:
+        if key in self._cache:
+            return self._cache[key]
+        entry = self._entries[key]
+        with open(os.path.join(self._texts_dir, entry["file"]), "rb") as f:
+            text = zlib.decompress(f.read()).decode("utf-8")
+        self._cache[key] = text
+        return text
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._cache[key] = value
+        self._entries.setdefault(key, {})["length"] = len(value)
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+        self._cache.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def text_length(self, key: str) -> int:
+        """Character count of a stored text, without decompressing it."""
+        return self._entries[key].get("length", 0)
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether a text has already been decompressed into the cache."""
+        return key in self._cache
+
+    def copy(self) -> "LazyTextStore":
+        """Shallow copy sharing the decompression cache (texts are immutable)."""
+        clone = LazyTextStore(self._texts_dir, self._entries)
+        clone._cache = self._cache
+        return clone
+
+
+class _LazyIndexMetadata:
+    """
+    Deferred, shared loader for index.pkl (docstore + id mapping).
+
+    Unpickling the docstore is the other half of cold-start cost besides
+    reading the FAISS index; both proxies below share one loader so the
+    file is read at most once, on first actual use.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._data = None
+
+    def load(self):
+        if self._data is None:
+            with open(self._path, "rb") as f:
+                self._data = pickle.load(f)
+        return self._data
+
+
+class _LazyDocstore:
+    """Docstore proxy that unpickles the real store on first attribute use."""
+
+    def __init__(self, loader: _LazyIndexMetadata):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader.load()[0], name)
+
+
+class _LazyDocstoreIdMap(MutableMapping):
+    """index_to_docstore_id proxy backed by the shared deferred loader."""
+
+    def __init__(self, loader: _LazyIndexMetadata):
+        self._loader = loader
+
+    def __getitem__(self, key):
+        return self._loader.load()[1][key]
+
+    def __setitem__(self, key, value):
+        self._loader.load()[1][key] = value
+
+    def __delitem__(self, key):
+        del self._loader.load()[1][key]
+
+    def __iter__(self):
+        return iter(self._loader.load()[1])
+
+    def __len__(self):
+        return len(self._loader.load()[1])
 
 
 class PersistenceManager:
@@ -33,19 +158,35 @@ class PersistenceManager:
         self.storage_dir = storage_dir
         self.faiss_index_path = os.path.join(storage_dir, "vector_store")
         self.metadata_path = os.path.join(storage_dir, "metadata.json")
+        self.texts_dir = os.path.join(storage_dir, "texts")
+        self.parent_store_path = os.path.join(storage_dir, "parent_store.pkl")
+        # Index of the last-written text blobs (with content digests) so
+        # incremental saves skip recompressing unchanged files
+        self._last_text_index: Dict[str, Dict] = {}
         
         # Ensure storage directory exists (absolute path expected)
         os.makedirs(self.storage_dir, exist_ok=True)
     
-    def save_knowledge_base(self, vector_store: FAISS, file_names: List[str], 
-                          raw_texts: Dict[str, str]) -> None:
+    def save_knowledge_base(self, vector_store: FAISS, file_names: List[str],
+                          raw_texts: Dict[str, str],
+                          source_ids: Dict[str, List[str]] = None,
+                          content_digests: Dict[str, str] = None,
+                          parent_store: Dict = None) -> None:
         """
         Save the complete knowledge base state to disk.
-        
+
         Args:
             vector_store: FAISS vector store to save
             file_names: List of processed file names
             raw_texts: Dictionary mapping file names to raw content
+            source_ids: Optional mapping of source filename to docstore ids,
+                persisted so loads can skip rebuilding it from the docstore
+            content_digests: Optional mapping of content digest to file
+                name, persisted so re-uploads of identical bytes are
+                detected across restarts
+            parent_store: Optional mapping of parent_id to parent Document,
+                persisted so loads never re-chunk the whole corpus just to
+                repopulate small-to-big retrieval
         """
         print("💾 Saving knowledge base to disk...")
         
@@ -55,16 +196,29 @@ class PersistenceManager:
                 vector_store.save_local(self.faiss_index_path)
                 print(f"  📚 Vector store saved to {self.faiss_index_path}")
             
+            # Save raw texts as per-file compressed blobs; metadata keeps
+            # only a small index so startup doesn't load every document body
+            raw_text_index = self._save_raw_texts(raw_texts)
+
+            # Save parent documents (an empty dict is still written so a
+            # later load doesn't fall back to re-chunking the corpus)
+            if parent_store is not None:
+                self._atomic_write(
+                    self.parent_store_path,
+                    pickle.dumps(parent_store, protocol=pickle.HIGHEST_PROTOCOL),
+                )
+
             # Save metadata
             metadata = {
                 "file_names": file_names,
-                "raw_texts": raw_texts,
+                "raw_text_index": raw_text_index,
+                "source_ids": source_ids or {},
+                "content_digests": content_digests or {},
                 "vector_store_exists": vector_store is not None,
                 "document_count": len(file_names)
             }
             
-            with open(self.metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            self._write_metadata(metadata)
             
             print(f"  📋 Metadata saved to {self.metadata_path}")
             print(f"✅ Knowledge base saved successfully ({len(file_names)} documents)")
@@ -72,54 +226,241 @@ class PersistenceManager:
         except Exception as e:
             print(f"❌ Error saving knowledge base: {str(e)}")
             raise
-    
-    def load_knowledge_base(self, embedding_provider) -> Tuple[Optional[FAISS], List[str], Dict[str, str]]:
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        """
+        Write a file atomically: temp file, fsync, then rename into place.
+
+        A crash mid-write leaves the previous version intact instead of a
+        truncated file, so the knowledge base never needs rebuilding after
+        an interrupted save.
+
+        Args:
+            path: Final destination path
+            data: Bytes to write
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _write_metadata(self, metadata: Dict) -> None:
+        """
+        Serialize the metadata index to disk atomically.
+
+        Args:
+            metadata: Metadata dictionary to persist
+        """
+        if orjson is not None:
+            payload = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(metadata, ensure_ascii=False, indent=2).encode("utf-8")
+        self._atomic_write(self.metadata_path, payload)
+
+    def _read_metadata(self) -> Dict:
+        """
+        Deserialize the metadata index from disk.
+
+        Returns:
+            Metadata dictionary
+        """
+        if orjson is not None:
+            with open(self.metadata_path, "rb") as f:
+                return orjson.loads(f.read())
+        with open(self.metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_raw_texts(self, raw_texts: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        Persist raw texts as compressed per-file blobs.
+
+        Blobs whose text was never decompressed this session, or whose
+        content digest matches the last write, are reused as-is, so an
+        incremental save only compresses new or changed files.
+
+        Args:
+            raw_texts: Mapping of file name to raw text content
+
+        Returns:
+            Index mapping file name to {"file": blob name, "length": chars}
+        """
+        os.makedirs(self.texts_dir, exist_ok=True)
+
+        index = {}
+        live_blobs = set()
+        for file_name in raw_texts:
+            blob_name = hashlib.blake2b(
+                file_name.encode("utf-8"), digest_size=8
+            ).hexdigest() + ".z"
+            blob_path = os.path.join(self.texts_dir, blob_name)
+            live_blobs.add(blob_name)
+            previous = self._last_text_index.get(file_name, {})
+
+            if (isinstance(raw_texts, LazyTextStore)
+                    and not raw_texts.is_loaded(file_name)
+                    and os.path.exists(blob_path)):
+                # Unchanged on-disk text; keep the existing blob
+                index[file_name] = {
+                    "file": blob_name,
+                    "length": raw_texts.text_length(file_name),
+                }
+                if "digest" in previous:
+                    index[file_name]["digest"] = previous["digest"]
+                continue
+
+            text = raw_texts[file_name]
+            encoded = text.encode("utf-8")
+            digest = hashlib.blake2b(encoded, digest_size=8).hexdigest()
+            if previous.get("digest") == digest and os.path.exists(blob_path):
+                # Same content as the last write; skip the compress + write
+                index[file_name] = {
+                    "file": blob_name, "length": len(text), "digest": digest
+                }
+                continue
+
+            self._atomic_write(blob_path, zlib.compress(encoded, level=6))
+            index[file_name] = {"file": blob_name, "length": len(text), "digest": digest}
+
+        # Drop blobs for deleted files
+        for blob_name in os.listdir(self.texts_dir):
+            if blob_name not in live_blobs:
+                try:
+                    os.remove(os.path.join(self.texts_dir, blob_name))
+                except OSError:
+                    pass
+
+        self._last_text_index = index
+        return index
+
+    def load_knowledge_base(self, embedding_provider) -> Tuple[
+            Optional[FAISS], List[str], Dict[str, str],
+            Dict[str, List[str]], Dict[str, str]]:
         """
         Load the complete knowledge base state from disk.
-        
+
         Args:
             embedding_provider: Embedding provider for loading vector store
-            
+
         Returns:
-            Tuple of (vector_store, file_names, raw_texts)
+            Tuple of (vector_store, file_names, raw_texts, source_ids,
+            content_digests)
         """
         print("📂 Loading knowledge base from disk...")
-        
+
         # Check if metadata exists
         if not os.path.exists(self.metadata_path):
             print("No existing knowledge base found")
-            return None, [], {}
+            return None, [], {}, {}, {}
         
         try:
             # Load metadata
-            with open(self.metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-            
+            metadata = self._read_metadata()
+
             file_names = metadata.get("file_names", [])
-            raw_texts = metadata.get("raw_texts", {})
+            if "raw_text_index" in metadata:
+                raw_texts = LazyTextStore(self.texts_dir, metadata["raw_text_index"])
+                self._last_text_index = metadata["raw_text_index"]
+            else:
+                # Legacy layout with texts inlined in metadata.json
+                raw_texts = metadata.get("raw_texts", {})
             vector_store_exists = metadata.get("vector_store_exists", False)
             
             # Load vector store if it exists
             vector_store = None
             if vector_store_exists and os.path.exists(self.faiss_index_path):
                 embeddings_model = embedding_provider.get_embeddings()
-                vector_store = FAISS.load_local(
-                    self.faiss_index_path, 
-                    embeddings_model,
-                    allow_dangerous_deserialization=True
-                )
+                vector_store = self._load_vector_store(embeddings_model)
                 print(f"  📚 Vector store loaded from {self.faiss_index_path}")
             
             print(f"  📋 Metadata loaded: {len(file_names)} documents")
             print(f"✅ Knowledge base loaded successfully")
-            
-            return vector_store, file_names, raw_texts
-            
+
+            return (vector_store, file_names, raw_texts,
+                    metadata.get("source_ids", {}),
+                    metadata.get("content_digests", {}))
+
         except Exception as e:
             print(f"❌ Error loading knowledge base: {str(e)}")
             print("Knowledge base may be corrupted, starting fresh")
-            return None, [], {}
-    
+            return None, [], {}, {}, {}
+
+    def load_parent_store(self) -> Optional[Dict]:
+        """
+        Load the persisted parent documents, if any.
+
+        Returns:
+            Dict mapping parent_id to parent Document, or None when no
+            (readable) parent store was persisted — callers may then fall
+            back to deriving parents from the raw texts.
+        """
+        if not os.path.exists(self.parent_store_path):
+            return None
+        try:
+            with open(self.parent_store_path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not load parent store: {str(e)}")
+            return None
+
+    def _load_vector_store(self, embeddings_model) -> FAISS:
+        """
+        Load the FAISS store, memory-mapping the index file when possible.
+
+        Memory-mapping avoids reading the whole index into process RAM at
+        startup; pages are faulted in on demand during search. The store is
+        marked mmap-backed so mutations can materialize a writable copy
+        first (see VectorStoreManager). The docstore pickle is wrapped in
+        lazy proxies and only unpickled when a query first touches it, so
+        startup cost stays at filesystem metadata level.
+
+        Args:
+            embeddings_model: Embedding model for the store wrapper
+
+        Returns:
+            Loaded FAISS vector store
+        """
+        try:
+            if not FAISS_MMAP:
+                raise RuntimeError("mmap loading disabled via FAISS_MMAP")
+            index = faiss.read_index(
+                os.path.join(self.faiss_index_path, "index.faiss"),
+                faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            )
+            loader = _LazyIndexMetadata(
+                os.path.join(self.faiss_index_path, "index.pkl")
+            )
+            docstore = _LazyDocstore(loader)
+            index_to_docstore_id = _LazyDocstoreIdMap(loader)
+
+            kwargs = {}
+            if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+                kwargs = {
+                    "normalize_L2": True,
+                    "distance_strategy": DistanceStrategy.MAX_INNER_PRODUCT,
+                }
+
+            vector_store = FAISS(
+                embedding_function=embeddings_model,
+                index=index,
+                docstore=docstore,
+                index_to_docstore_id=index_to_docstore_id,
+                **kwargs
+            )
+            vector_store._mmap_backed = True
+            return vector_store
+
+        except Exception as e:
+            # Not every index type supports mmap IO; fall back to a full read
+            print(f"  mmap load unavailable ({str(e)}), using standard load")
+            return FAISS.load_local(
+                self.faiss_index_path,
+                embeddings_model,
+                allow_dangerous_deserialization=True
+            )
+
     def knowledge_base_exists(self) -> bool:
         """
         Check if a knowledge base exists on disk.
@@ -141,9 +482,8 @@ class PersistenceManager:
             return {"exists": False}
         
         try:
-            with open(self.metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-            
+            metadata = self._read_metadata()
+
             return {
                 "exists": True,
                 "document_count": len(metadata.get("file_names", [])),
@@ -165,9 +505,10 @@ class PersistenceManager:
             if os.path.exists(self.storage_dir):
                 shutil.rmtree(self.storage_dir)
                 print("✅ Knowledge base storage cleared")
-            
+
             # Recreate empty storage directory
             os.makedirs(self.storage_dir, exist_ok=True)
+            self._last_text_index = {}
             
         except Exception as e:
             print(f"❌ Error clearing storage: {str(e)}")
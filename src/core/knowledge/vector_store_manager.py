@@ -8,9 +8,149 @@ Responsible for:
 - Vector store serialization and loading
 """
 
+import hashlib
+import os
+import uuid
 from typing import List, Optional, Dict, Any
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+# FAISS search kernels are OpenMP-parallel; let them use every core.
+faiss.omp_set_num_threads(os.cpu_count() or 1)
+
+# Opt-in GPU search for high-QPS deployments (requires faiss-gpu + CUDA).
+FAISS_USE_GPU = os.getenv("FAISS_USE_GPU", "").lower() in ("1", "true", "yes")
+
+# Scalar quantizer for stored vectors: int8 (4x smaller than float32,
+# default) or fp16 (2x smaller, near-lossless) via RAG_SQ_TYPE.
+RAG_SQ_TYPE = os.getenv("RAG_SQ_TYPE", "int8").lower()
+
+# Above this many vectors, switch from HNSW-SQ to an OPQ+IVF+PQ composite:
+# coarse clustering plus product quantization keeps both search time and
+# bytes-per-vector nearly flat as the corpus keeps growing.
+IVF_PQ_THRESHOLD = 10_000
+
+
+def _gpu_available() -> bool:
+    """Check whether FAISS was built with GPU support and a GPU is present."""
+    return (
+        hasattr(faiss, "get_num_gpus")
+        and hasattr(faiss, "index_cpu_to_gpu")
+        and faiss.get_num_gpus() > 0
+    )
+
+
+def _apply_search_tuning(index: faiss.Index) -> None:
+    """
+    Apply query-time search knobs from the environment to an index.
+
+    RAG_NPROBE widens the IVF cluster probe count and RAG_EFSEARCH the
+    HNSW graph exploration; both trade latency for recall at query time
+    without retraining. When unset, the defaults chosen at build time
+    stay in effect.
+
+    Args:
+        index: Index to tune (composites are traversed automatically)
+    """
+    for param, env_var in (("nprobe", "RAG_NPROBE"), ("efSearch", "RAG_EFSEARCH")):
+        raw = os.getenv(env_var, "")
+        if not raw:
+            continue
+        try:
+            faiss.ParameterSpace().set_index_parameter(index, param, int(raw))
+            print(f"🔧 Applied {env_var}={raw}")
+        except (RuntimeError, ValueError):
+            # Knob doesn't exist on this index type; ignore
+            pass
+
+
+def stable_document_order(documents: List[Document]) -> List[Document]:
+    """
+    Order retrieved documents deterministically by content hash.
+
+    Retrieval scores jitter between near-identical queries, which shuffles
+    the context block and defeats provider-side prompt prefix caching.
+    A content-hash sort makes the same retrieved set always render the
+    same prompt. All returned chunks go into the context regardless of
+    order, so ranking information is not lost to the LLM.
+    """
+    return sorted(
+        documents,
+        key=lambda doc: hashlib.blake2b(
+            doc.page_content.encode("utf-8"), digest_size=8
+        ).digest(),
+    )
+
+
+def _mmr_select(query_vec: np.ndarray, candidate_vecs: np.ndarray,
+                k: int, lambda_mult: float) -> List[int]:
+    """
+    Select k candidates by maximal marginal relevance, vectorized.
+
+    Every score update is a whole-array NumPy operation (BLAS dot
+    products over SIMD lanes); only the greedy k-step selection itself is
+    a Python loop, which is inherent to MMR. Vectors are unit-norm, so
+    inner products are cosine similarities.
+
+    Args:
+        query_vec: Query embedding, shape (dim,)
+        candidate_vecs: Candidate embeddings, shape (n, dim)
+        k: Number of candidates to select
+        lambda_mult: Relevance/diversity trade-off (1.0 = pure relevance)
+
+    Returns:
+        Indices into candidate_vecs, in selection order
+    """
+    n = len(candidate_vecs)
+    if n == 0 or k <= 0:
+        return []
+    k = min(k, n)
+
+    relevance = candidate_vecs @ query_vec
+    selected = [int(np.argmax(relevance))]
+    # Running max similarity of every candidate to the selected set
+    max_sim = candidate_vecs @ candidate_vecs[selected[0]]
+
+    for _ in range(k - 1):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_sim
+        scores[selected] = -np.inf
+        chosen = int(np.argmax(scores))
+        selected.append(chosen)
+        np.maximum(max_sim, candidate_vecs @ candidate_vecs[chosen], out=max_sim)
+
+    return selected
+
+
+def _simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash over word trigrams of the text.
+
+    Near-identical texts (reworded boilerplate, version banners, repeated
+    footers) land within a few bits of each other, so Hamming distance
+    gives a cheap near-duplicate test without any embedding call.
+    """
+    tokens = text.lower().split()
+    if len(tokens) < 3:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = [
+            " ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)
+        ]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(64):
+            weights[bit] += 1 if (value >> bit) & 1 else -1
+
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
 
 
 class VectorStoreManager:
@@ -21,15 +161,43 @@ class VectorStoreManager:
     updates, search, and persistence of the vector index.
     """
     
-    def __init__(self, embedding_provider):
+    def __init__(self, embedding_provider, embedding_cache=None):
         """
         Initialize the vector store manager.
-        
+
         Args:
             embedding_provider: Embedding provider for vectorization
+            embedding_cache: Optional persistent EmbeddingCache consulted
+                before calling the embedding API
         """
         self.embedding_provider = embedding_provider
+        self.embedding_cache = embedding_cache
         self.vector_store: Optional[FAISS] = None
+
+        # Parent documents for small-to-big retrieval: child chunks are
+        # indexed, but retrieval results are expanded to their parents.
+        # After a load the store stays empty until first use; the loader
+        # callable materializes it on demand so cold start never pays for it.
+        self.parent_store: Dict[str, Document] = {}
+        self._parent_store_loader = None
+
+        # Tracks whether the index currently lives on a GPU
+        self._index_on_gpu = False
+
+        # Binary (sign-bit) shadow index over the same vectors, used as a
+        # cheap Hamming-distance first stage before inner-product reranking.
+        # None whenever it can't be kept aligned with the main index.
+        self._binary_index = None
+
+        # Maps source filename to its docstore ids so deletion doesn't have
+        # to scan the whole docstore per file. None means "stale": rebuilt
+        # on first use so a freshly loaded store stays lazily deserialized.
+        self._source_to_ids: Optional[Dict[str, List[str]]] = {}
+
+        # Corpus size the current index structure was built/trained for,
+        # used to decide when growth warrants a retrain (see
+        # _maybe_retrain_index).
+        self._index_trained_on = 0
     
     def create_vector_store(self, documents: List[Document]) -> FAISS:
         """
@@ -43,14 +211,214 @@ class VectorStoreManager:
         """
         if not documents:
             raise ValueError("Cannot create vector store with empty document list")
-        
+
+        documents, texts = self._filter_near_duplicates(documents)
+
         print("🔤 Creating embeddings...")
-        embeddings_model = self.embedding_provider.get_embeddings()
-        
-        self.vector_store = FAISS.from_documents(documents, embeddings_model)
-        
+        vectors = self._embed_documents(texts)
+
+        index = self._build_index(vectors)
+
+        # Wrap the raw index in the LangChain FAISS interface so retrievers,
+        # persistence and deletion keep working unchanged.
+        ids = [str(uuid.uuid4()) for _ in documents]
+        self.vector_store = FAISS(
+            embedding_function=self.embedding_provider.get_embeddings(),
+            index=index,
+            docstore=InMemoryDocstore(dict(zip(ids, documents))),
+            index_to_docstore_id=dict(enumerate(ids)),
+            normalize_L2=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        )
+
+        self._source_to_ids = {}
+        self._record_source_ids(documents, ids)
+
+        self._binary_index = None
+        self._extend_binary_index(vectors)
+
+        self.promote_index_to_gpu()
+
         print(f"✅ Vector store created with {len(documents)} document chunks")
         return self.vector_store
+
+    def _filter_near_duplicates(self, documents: List[Document],
+                                max_distance: int = 3):
+        """
+        Drop chunks that are near-duplicates of an earlier chunk in the batch.
+
+        Exact duplicates are already collapsed by the embedding pipeline;
+        this catches almost-identical text (repeated headers with varying
+        page numbers, templated paragraphs) via SimHash, before any
+        embedding cost is paid. Comparison is within the batch only, so
+        re-adding a deleted file is never blocked by stale state.
+
+        Texts are projected out of the Document objects once here and
+        returned alongside them, so downstream hashing/embedding steps
+        don't re-materialize the same string lists.
+
+        Args:
+            documents: Candidate chunks in order
+            max_distance: Maximum Hamming distance counted as a duplicate
+
+        Returns:
+            Tuple of (kept documents, their texts), near-duplicates removed
+            with first occurrence winning
+        """
+        texts = np.array([doc.page_content for doc in documents], dtype=object)
+        keep_mask = np.ones(len(documents), dtype=bool)
+
+        hashes: List[int] = []
+        for i, text in enumerate(texts):
+            signature = _simhash(text)
+            if any((signature ^ seen).bit_count() <= max_distance for seen in hashes):
+                keep_mask[i] = False
+                continue
+            hashes.append(signature)
+
+        dropped = len(documents) - int(keep_mask.sum())
+        if dropped:
+            print(f"🧹 Skipping {dropped} near-duplicate chunks (SimHash)")
+            documents = [doc for doc, keep in zip(documents, keep_mask) if keep]
+            texts = texts[keep_mask]
+
+        return documents, list(texts)
+
+    def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts and L2-normalize them for inner-product search.
+
+        Identical texts (shared headers, footers, boilerplate) are embedded
+        only once and their vector is reused for every occurrence, cutting
+        API cost on repetitive corpora. When a persistent embedding cache
+        is configured, previously embedded texts are served from it too.
+
+        Args:
+            texts: List of chunk texts to embed
+
+        Returns:
+            Contiguous float32 matrix of unit-norm embeddings, one row per text
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        unique_positions: Dict[bytes, int] = {}
+        unique_digests: List[bytes] = []
+        unique_texts: List[str] = []
+        row_for_text: List[int] = []
+
+        for text in texts:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            position = unique_positions.get(digest)
+            if position is None:
+                position = len(unique_texts)
+                unique_positions[digest] = position
+                unique_digests.append(digest)
+                unique_texts.append(text)
+            row_for_text.append(position)
+
+        duplicates = len(texts) - len(unique_texts)
+        if duplicates:
+            print(f"♻️ Reusing embeddings for {duplicates} duplicate chunks")
+
+        cached = {}
+        if self.embedding_cache:
+            cached = self.embedding_cache.get_many(unique_digests)
+            if cached:
+                print(f"💾 Embedding cache: {len(cached)} of {len(unique_texts)} chunks reused")
+
+        miss_rows = [i for i, d in enumerate(unique_digests) if d not in cached]
+        new_vectors = None
+        if miss_rows:
+            new_vectors = np.asarray(
+                self.embedding_provider.embed_documents_batched(
+                    [unique_texts[i] for i in miss_rows]
+                ),
+                dtype=np.float32,
+            )
+            faiss.normalize_L2(new_vectors)
+
+        dim = (new_vectors.shape[1] if new_vectors is not None
+               else len(next(iter(cached.values()))))
+        vectors = np.empty((len(unique_texts), dim), dtype=np.float32)
+        for i, digest in enumerate(unique_digests):
+            if digest in cached:
+                vectors[i] = cached[digest]
+        if miss_rows:
+            vectors[miss_rows] = new_vectors
+
+        if self.embedding_cache and miss_rows:
+            self.embedding_cache.put_many(
+                (unique_digests[i], vectors[i]) for i in miss_rows
+            )
+
+        return np.ascontiguousarray(vectors[row_for_text])
+
+    def _build_index(self, vectors: np.ndarray) -> faiss.Index:
+        """
+        Build a FAISS index from embedding vectors.
+
+        Corpora past IVF_PQ_THRESHOLD get an OPQ32,IVF256,PQ32 composite
+        (sub-linear cluster-probed search, ~32 bytes/vector); smaller ones
+        keep the HNSW graph, which needs no cluster training and has
+        better recall at small scale.
+
+        Args:
+            vectors: Normalized float32 embedding matrix
+
+        Returns:
+            Trained FAISS index with all vectors added
+        """
+        if len(vectors) >= IVF_PQ_THRESHOLD:
+            index = faiss.index_factory(
+                vectors.shape[1], "OPQ32,IVF256,PQ32", faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(vectors)
+            index.add(vectors)
+            ivf = faiss.extract_index_ivf(index)
+            ivf.nprobe = 16
+            # Reconstruction (retraining, MMR reranking) needs a direct map;
+            # IVF indexes don't build one by default
+            ivf.make_direct_map()
+            print(f"📦 Built IVF-PQ index for {len(vectors)} vectors")
+            _apply_search_tuning(index)
+            self._index_trained_on = len(vectors)
+            return index
+
+        index = self._new_index(vectors.shape[1])
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        _apply_search_tuning(index)
+        self._index_trained_on = len(vectors)
+        return index
+
+    def _new_index(self, dim: int) -> faiss.Index:
+        """
+        Create an empty HNSW index with this project's search parameters.
+
+        The graph makes search latency roughly logarithmic in corpus size
+        instead of linear like a flat scan, and scalar quantization of the
+        stored vectors cuts their memory footprint versus float32: 4x with
+        the int8 default, 2x (near-lossless) with RAG_SQ_TYPE=fp16.
+        Vectors are unit-norm, so inner product is equivalent to cosine.
+
+        Args:
+            dim: Embedding dimensionality
+
+        Returns:
+            Empty, configured FAISS index
+        """
+        quantizer_type = (
+            faiss.ScalarQuantizer.QT_fp16 if RAG_SQ_TYPE == "fp16"
+            else faiss.ScalarQuantizer.QT_8bit
+        )
+        index = faiss.IndexHNSWSQ(
+            dim, quantizer_type, 32, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 64
+        return index
     
     def add_documents_to_store(self, documents: List[Document]) -> None:
         """
@@ -69,11 +437,68 @@ class VectorStoreManager:
             print("No valid documents to add")
             return
         
+        documents, texts = self._filter_near_duplicates(documents)
+
         print(f"📝 Adding {len(documents)} new document chunks to vector store...")
-        self.vector_store.add_documents(documents)
-        
+
+        # Embed everything up front (deduplicated, normalized) and hand FAISS
+        # one contiguous matrix instead of letting the wrapper grow the index
+        # incrementally per document.
+        vectors = self._embed_documents(texts)
+
+        self._ensure_mutable_index()
+        added_ids = self.vector_store.add_embeddings(
+            text_embeddings=zip(texts, vectors),
+            metadatas=[doc.metadata for doc in documents],
+        )
+        self._record_source_ids(documents, added_ids)
+        self._extend_binary_index(vectors)
+        self._maybe_retrain_index()
+
         print("✅ Documents added to vector store successfully")
     
+    def _maybe_retrain_index(self) -> None:
+        """
+        Retrain or upgrade the index when additions outgrow its structure.
+
+        IVF centroids (and the HNSW-vs-IVF choice itself) are fixed when
+        the index is built; incremental adds work on a trained index, but
+        after enough growth new vectors land in stale clusters and recall
+        drifts. Rebuild from reconstructed vectors once the corpus has
+        doubled past what the index was trained on, or once an HNSW index
+        has grown past the IVF-PQ threshold. merge_from/append-style IO
+        was considered but doesn't retrain centroids, which is the actual
+        problem here.
+        """
+        if self._index_on_gpu:
+            return
+
+        index = self.vector_store.index
+        try:
+            faiss.extract_index_ivf(index)
+            is_ivf = True
+        except RuntimeError:
+            is_ivf = False
+
+        if is_ivf:
+            if index.ntotal < 2 * max(self._index_trained_on, 1):
+                return
+        elif index.ntotal < IVF_PQ_THRESHOLD:
+            return
+
+        print(f"🔁 Retraining index structure for {index.ntotal} vectors...")
+        try:
+            vectors = np.ascontiguousarray(
+                np.vstack([index.reconstruct(i) for i in range(index.ntotal)])
+            ).astype(np.float32)
+        except RuntimeError as e:
+            # e.g. an IVF index loaded without a direct map — skip the
+            # retrain rather than crash mid-mutation; the vectors just
+            # added are already searchable
+            print(f"⚠️ Skipping index retrain (cannot reconstruct vectors): {e}")
+            return
+        self.vector_store.index = self._build_index(vectors)
+
     def delete_documents_by_source(self, source_filename: str) -> bool:
         """
         Delete all document chunks from a specific source file.
@@ -89,20 +514,26 @@ class VectorStoreManager:
             return False
         
         try:
-            # Get all document IDs that match the source
-            all_docs = self.vector_store.docstore._dict
-            ids_to_delete = []
-            
-            for doc_id, doc in all_docs.items():
-                if hasattr(doc, 'metadata') and doc.metadata.get('source') == source_filename:
-                    ids_to_delete.append(doc_id)
-            
+            # Resolve ids from the source mapping instead of scanning the
+            # whole docstore per deletion.
+            self._ensure_source_index()
+            ids_to_delete = self._source_to_ids.get(source_filename, [])
+
             if not ids_to_delete:
                 print(f"No documents found for source: {source_filename}")
                 return False
-            
+
             # Delete the documents
-            self.vector_store.delete(ids_to_delete)
+            self._ensure_mutable_index()
+            try:
+                self.vector_store.delete(ids_to_delete)
+            except Exception:
+                # Graph indexes (HNSW) don't implement remove_ids
+                self._rebuild_index_without(set(ids_to_delete))
+            self._source_to_ids.pop(source_filename, None)
+            # Deletion shifts index positions; the shadow index is rebuilt
+            # on the next full ingest rather than patched in place
+            self._binary_index = None
             print(f"🗑️ Deleted {len(ids_to_delete)} chunks from {source_filename}")
             return True
             
@@ -110,6 +541,152 @@ class VectorStoreManager:
             print(f"Error deleting documents from {source_filename}: {str(e)}")
             return False
     
+    def _rebuild_index_without(self, ids_to_delete: set) -> None:
+        """
+        Rebuild the index from surviving vectors, dropping the given ids.
+
+        Fallback deletion path for index types without remove_ids support.
+        Survivors are reconstructed from the current index, so no re-embedding
+        is needed.
+
+        Args:
+            ids_to_delete: Docstore ids whose vectors should be dropped
+        """
+        index = self.vector_store.index
+        keep = [
+            (position, doc_id)
+            for position, doc_id in sorted(self.vector_store.index_to_docstore_id.items())
+            if doc_id not in ids_to_delete
+        ]
+
+        new_index = self._new_index(index.d)
+        if keep:
+            vectors = np.ascontiguousarray(
+                np.vstack([index.reconstruct(int(position)) for position, _ in keep])
+            )
+            if not new_index.is_trained:
+                new_index.train(vectors)
+            new_index.add(vectors)
+
+        self.vector_store.index = new_index
+        self.vector_store.index_to_docstore_id = {
+            i: doc_id for i, (_, doc_id) in enumerate(keep)
+        }
+        for doc_id in ids_to_delete:
+            self.vector_store.docstore._dict.pop(doc_id, None)
+
+    def _record_source_ids(self, documents: List[Document], ids: List[str]) -> None:
+        """
+        Record which docstore ids belong to each source filename.
+
+        Args:
+            documents: Documents just written to the store
+            ids: Docstore ids assigned to them, in the same order
+        """
+        self._ensure_source_index()
+        for doc, doc_id in zip(documents, ids):
+            source = doc.metadata.get("source")
+            if source:
+                self._source_to_ids.setdefault(source, []).append(doc_id)
+
+    def _extend_binary_index(self, vectors: np.ndarray) -> None:
+        """
+        Append sign-bit codes for new vectors to the binary shadow index.
+
+        Args:
+            vectors: The float32 vectors just added to the main index
+        """
+        if vectors.size == 0:
+            return
+
+        codes = np.packbits(vectors > 0, axis=1)
+        if self._binary_index is None:
+            self._binary_index = faiss.IndexBinaryFlat(vectors.shape[1])
+        self._binary_index.add(codes)
+
+    def _search_vectors(self, query_vectors: np.ndarray, k: int) -> List[List[int]]:
+        """
+        Find nearest index positions for each query vector.
+
+        When the binary shadow index is aligned with the main index, a
+        Hamming-distance scan (popcount, 192 bytes/vector) picks 64
+        candidates per query and the true inner product over their
+        reconstructed vectors reranks them — much cheaper than scoring
+        the whole corpus at full precision.
+
+        Args:
+            query_vectors: Unit-norm float32 query matrix
+            k: Number of results per query
+
+        Returns:
+            List of index-position lists, one per query
+        """
+        use_binary = (
+            self._binary_index is not None
+            and self._binary_index.ntotal == self.vector_store.index.ntotal
+            and self._binary_index.ntotal > 64
+        )
+
+        if use_binary:
+            try:
+                codes = np.packbits(query_vectors > 0, axis=1)
+                _, candidate_rows = self._binary_index.search(codes, 64)
+
+                results = []
+                for qi, row in enumerate(candidate_rows):
+                    candidates = [int(i) for i in row if i != -1]
+                    dense = np.vstack([
+                        self.vector_store.index.reconstruct(i) for i in candidates
+                    ])
+                    scores = dense @ query_vectors[qi]
+                    order = np.argsort(-scores)[:k]
+                    results.append([candidates[j] for j in order])
+                return results
+            except Exception:
+                # e.g. index types without reconstruct; use the main index
+                pass
+
+        _, indices = self.vector_store.index.search(query_vectors, k)
+        return [[int(i) for i in row if i != -1] for row in indices]
+
+    def get_source_id_map(self) -> Dict[str, List[str]]:
+        """
+        Get the source-to-docstore-ids mapping, rebuilding it if stale.
+
+        Returns:
+            Mapping of source filename to its docstore ids
+        """
+        self._ensure_source_index()
+        return self._source_to_ids
+
+    def set_source_id_map(self, mapping: Dict[str, List[str]]) -> None:
+        """
+        Install a persisted source-to-ids mapping.
+
+        Used after loading from disk so the mapping never has to be
+        rebuilt by scanning (and thereby deserializing) the docstore.
+
+        Args:
+            mapping: Mapping of source filename to docstore ids
+        """
+        self._source_to_ids = {source: list(ids) for source, ids in mapping.items()}
+
+    def _ensure_source_index(self) -> None:
+        """Rebuild the source-to-ids mapping if it has been marked stale."""
+        if self._source_to_ids is None:
+            self._rebuild_source_index()
+
+    def _rebuild_source_index(self) -> None:
+        """Rebuild the source-to-ids mapping with a single docstore scan."""
+        self._source_to_ids = {}
+        if not self.vector_store:
+            return
+
+        for doc_id, doc in self.vector_store.docstore._dict.items():
+            source = getattr(doc, "metadata", {}).get("source")
+            if source:
+                self._source_to_ids.setdefault(source, []).append(doc_id)
+
     def search_similar_documents(self, query: str, k: int = 8) -> List[Document]:
         """
         Search for similar documents in the vector store.
@@ -123,27 +700,292 @@ class VectorStoreManager:
         """
         if not self.vector_store:
             raise ValueError("No vector store available for search")
-        
-        return self.vector_store.similarity_search(query, k=k)
-    
-    def get_retriever(self, search_kwargs: Dict[str, Any] = None):
+
+        return self.search_similar_documents_batch([query], k)
+
+    def search_similar_documents_batch(self, queries: List[str], k: int = 8) -> List[Document]:
+        """
+        Search for documents similar to any of several queries in one pass.
+
+        Batching the queries into a single `index.search` call lets FAISS
+        parallelize across its OpenMP threads instead of paying per-query
+        overhead for each question variant.
+
+        Args:
+            queries: List of search queries
+            k: Number of results to return per query
+
+        Returns:
+            Deduplicated list of similar documents across all queries
+        """
+        if not self.vector_store:
+            raise ValueError("No vector store available for search")
+
+        if not queries:
+            return []
+
+        # One embedding request and the same unit-norm treatment as ingest,
+        # so the inner-product search needs no per-query distance correction.
+        query_vectors = self._embed_documents(queries)
+
+        position_rows = self._search_vectors(query_vectors, k)
+
+        # Merge result lists, keeping the first (best-ranked) hit per doc id.
+        seen_ids = set()
+        results = []
+        for row in position_rows:
+            for idx in row:
+                doc_id = self.vector_store.index_to_docstore_id.get(idx)
+                if doc_id is None or doc_id in seen_ids:
+                    continue
+                seen_ids.add(doc_id)
+                results.append(self.vector_store.docstore.search(doc_id))
+
+        return self._expand_to_parents(results)
+
+    def search_mmr(self, query: str, k: int = 4, fetch_k: int = 32,
+                   lambda_mult: float = 0.5) -> List[Document]:
+        """
+        Retrieve k diverse documents for a query via maximal marginal relevance.
+
+        Fetches fetch_k nearest candidates through the usual search path
+        (binary prefilter included), reconstructs their vectors from the
+        index, and reranks with the vectorized MMR kernel — no re-embedding
+        and no per-candidate Python arithmetic.
+
+        Args:
+            query: Search query
+            k: Number of documents to return
+            fetch_k: Candidate pool size before diversity reranking
+            lambda_mult: Relevance/diversity trade-off (1.0 = pure relevance)
+
+        Returns:
+            Selected documents, expanded to their parents
+        """
+        if not self.vector_store:
+            raise ValueError("No vector store available for search")
+
+        query_vectors = self._embed_documents([query])
+        position_rows = self._search_vectors(query_vectors, fetch_k)
+        positions = [int(idx) for idx in position_rows[0] if idx != -1]
+        if not positions:
+            return []
+
+        index = self.vector_store.index
+        try:
+            candidate_vecs = np.vstack(
+                [index.reconstruct(position) for position in positions]
+            ).astype(np.float32)
+            order = _mmr_select(query_vectors[0], candidate_vecs, k, lambda_mult)
+        except RuntimeError:
+            # Index type can't reconstruct (e.g. IVF without a direct map);
+            # fall back to plain top-k ordering
+            order = range(min(k, len(positions)))
+
+        results = []
+        for i in order:
+            doc_id = self.vector_store.index_to_docstore_id.get(positions[i])
+            if doc_id is not None:
+                results.append(self.vector_store.docstore.search(doc_id))
+
+        return self._expand_to_parents(results)
+
+    def set_parent_documents(self, parents: Dict[str, Document], replace: bool = False) -> None:
+        """
+        Register parent documents for small-to-big retrieval.
+
+        Args:
+            parents: Dict mapping parent_id to parent Document
+            replace: If True, discard any previously registered parents
+        """
+        if replace:
+            self.parent_store = {}
+            self._parent_store_loader = None
+        else:
+            # Incremental update must merge into the full persisted set
+            self._ensure_parent_store()
+        self.parent_store.update(parents)
+
+    def set_parent_store_loader(self, loader) -> None:
+        """
+        Defer parent-store materialization until the first time it's needed.
+
+        Args:
+            loader: Zero-argument callable returning the parent dict
+        """
+        self.parent_store = {}
+        self._parent_store_loader = loader
+
+    def _ensure_parent_store(self) -> None:
+        """Run the deferred loader, if one is pending."""
+        if self._parent_store_loader is None:
+            return
+        loader, self._parent_store_loader = self._parent_store_loader, None
+        try:
+            self.parent_store = loader() or {}
+        except Exception as e:
+            print(f"⚠️ Could not load parent store: {str(e)}")
+            self.parent_store = {}
+
+    def get_parent_store(self) -> Dict[str, Document]:
+        """Return the (materialized) parent store, e.g. for persistence."""
+        self._ensure_parent_store()
+        return self.parent_store
+
+    def remove_parents_for_source(self, source_filename: str) -> None:
+        """
+        Remove all parent documents belonging to a source file.
+
+        Args:
+            source_filename: Name of the source file to remove
+        """
+        self._ensure_parent_store()
+        self.parent_store = {
+            parent_id: doc for parent_id, doc in self.parent_store.items()
+            if doc.metadata.get("source") != source_filename
+        }
+
+    def _expand_to_parents(self, documents: List[Document]) -> List[Document]:
+        """
+        Map retrieved child chunks to their unique parent documents.
+
+        Args:
+            documents: Retrieved child chunks
+
+        Returns:
+            Parent documents in first-hit order (children without a known
+            parent pass through unchanged)
+        """
+        self._ensure_parent_store()
+        if not self.parent_store:
+            return documents
+
+        expanded = []
+        seen_parents = set()
+        for doc in documents:
+            parent_id = doc.metadata.get("parent_id")
+            parent = self.parent_store.get(parent_id)
+            if parent is None:
+                expanded.append(doc)
+            elif parent_id not in seen_parents:
+                seen_parents.add(parent_id)
+                expanded.append(parent)
+
+        return expanded
+
+    def get_retriever(self, search_kwargs: Dict[str, Any] = None,
+                      search_type: str = "similarity"):
         """
         Get a retriever for the vector store.
-        
+
         Args:
             search_kwargs: Optional search configuration
-            
+            search_type: Retrieval strategy ("similarity" or "mmr")
+
         Returns:
             Vector store retriever
         """
         if not self.vector_store:
             raise ValueError("No vector store available")
-        
+
         if search_kwargs is None:
             search_kwargs = {"k": 8}
-        
-        return self.vector_store.as_retriever(search_kwargs=search_kwargs)
+
+        if search_type == "mmr":
+            # In-house vectorized MMR over reconstructed candidate vectors;
+            # avoids the wrapper's per-candidate Python scoring loop
+            def _retrieve_mmr(query):
+                if isinstance(query, dict):
+                    query = query.get("input", "")
+                documents = self.search_mmr(
+                    query,
+                    k=search_kwargs.get("k", 4),
+                    fetch_k=search_kwargs.get("fetch_k", 32),
+                    lambda_mult=search_kwargs.get("lambda_mult", 0.5),
+                )
+                # Deterministic context ordering keeps prompt prefixes cacheable
+                return stable_document_order(documents)
+
+            return RunnableLambda(_retrieve_mmr)
+
+        retriever = self.vector_store.as_retriever(
+            search_type=search_type, search_kwargs=search_kwargs
+        )
+
+        def _retrieve(query):
+            # Retrieval chains pass {"input": ...}; direct callers pass a string
+            if isinstance(query, dict):
+                query = query.get("input", "")
+            documents = retriever.invoke(query)
+            documents = self._expand_to_parents(documents)
+            # Deterministic context ordering keeps prompt prefixes cacheable
+            return stable_document_order(documents)
+
+        return RunnableLambda(_retrieve)
     
+    def _ensure_mutable_index(self) -> None:
+        """
+        Materialize a writable copy of the index if it is mmap-backed.
+
+        Indexes loaded with IO_FLAG_MMAP are read-only; mutations (add,
+        delete) need an in-RAM clone first.
+        """
+        if self.vector_store and getattr(self.vector_store, "_mmap_backed", False):
+            self.vector_store.index = faiss.clone_index(self.vector_store.index)
+            self.vector_store._mmap_backed = False
+
+    def promote_index_to_gpu(self) -> bool:
+        """
+        Move the FAISS index to GPU for faster search, if enabled and possible.
+
+        Gated on the FAISS_USE_GPU environment variable; the persisted index
+        stays in CPU format (see demote_index_to_cpu), so GPU promotion only
+        affects serve-time search.
+
+        Returns:
+            True if the index now lives on a GPU
+        """
+        if not FAISS_USE_GPU or not self.vector_store or self._index_on_gpu:
+            return self._index_on_gpu
+
+        if not _gpu_available():
+            return False
+
+        try:
+            num_gpus = faiss.get_num_gpus()
+            if num_gpus > 1 and hasattr(faiss, "index_cpu_to_all_gpus"):
+                # Shard across all GPUs; queries fan out and merge in FAISS
+                self.vector_store.index = faiss.index_cpu_to_all_gpus(
+                    self.vector_store.index
+                )
+                print(f"⚡ FAISS index sharded across {num_gpus} GPUs")
+            else:
+                resources = faiss.StandardGpuResources()
+                self.vector_store.index = faiss.index_cpu_to_gpu(
+                    resources, 0, self.vector_store.index
+                )
+                print("⚡ FAISS index moved to GPU")
+            self._index_on_gpu = True
+        except Exception as e:
+            # Not all index types are GPU-compatible; keep searching on CPU
+            print(f"FAISS GPU promotion failed, staying on CPU: {str(e)}")
+
+        return self._index_on_gpu
+
+    def demote_index_to_cpu(self) -> bool:
+        """
+        Move the FAISS index back to CPU (required before serialization).
+
+        Returns:
+            True if the index was on GPU and has been moved back
+        """
+        if not self._index_on_gpu or not self.vector_store:
+            return False
+
+        self.vector_store.index = faiss.index_gpu_to_cpu(self.vector_store.index)
+        self._index_on_gpu = False
+        return True
+
     def get_vector_store(self) -> Optional[FAISS]:
         """
         Get the current vector store instance.
@@ -161,6 +1003,16 @@ class VectorStoreManager:
             vector_store: FAISS vector store to set
         """
         self.vector_store = vector_store
+        self._index_on_gpu = False
+        # Mark stale rather than scanning now: a store loaded from disk is
+        # lazily deserialized and an eager scan would defeat that
+        self._source_to_ids = None if vector_store is not None else {}
+        self._binary_index = None
+        # A persisted index was built for its current contents
+        self._index_trained_on = vector_store.index.ntotal if vector_store else 0
+        if vector_store is not None:
+            _apply_search_tuning(vector_store.index)
+            self.promote_index_to_gpu()
     
     def get_document_count(self) -> int:
         """
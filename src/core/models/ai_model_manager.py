@@ -30,29 +30,66 @@ class AIModelManager:
         self.api_key = api_key
         self._llm_provider = None
         self._embedding_provider = None
-    
+        self._http_client = None
+        self._http_async_client = None
+
+    def _get_http_clients(self):
+        """
+        Get the shared httpx clients, creating them on first use.
+
+        A single keep-alive connection pool shared by the LLM and embedding
+        providers avoids a TCP+TLS handshake per request. HTTP/2 is used
+        when the optional h2 package is available.
+
+        Returns:
+            Tuple of (httpx.Client, httpx.AsyncClient)
+        """
+        if self._http_client is None:
+            import httpx
+
+            limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            try:
+                self._http_client = httpx.Client(http2=True, limits=limits)
+                self._http_async_client = httpx.AsyncClient(http2=True, limits=limits)
+            except ImportError:
+                # h2 not installed; HTTP/1.1 keep-alive still pools connections
+                self._http_client = httpx.Client(limits=limits)
+                self._http_async_client = httpx.AsyncClient(limits=limits)
+
+        return self._http_client, self._http_async_client
+
     def get_llm_provider(self) -> LLMProvider:
         """
         Get the LLM provider instance.
-        
+
         Returns:
             LLMProvider: Language model provider
         """
         if self._llm_provider is None:
-            self._llm_provider = LLMProvider(self.api_key)
-        
+            http_client, http_async_client = self._get_http_clients()
+            self._llm_provider = LLMProvider(
+                self.api_key,
+                http_client=http_client,
+                http_async_client=http_async_client
+            )
+
         return self._llm_provider
-    
+
     def get_embedding_provider(self) -> EmbeddingProvider:
         """
         Get the embedding provider instance.
-        
+
         Returns:
             EmbeddingProvider: Embedding model provider
         """
         if self._embedding_provider is None:
-            self._embedding_provider = EmbeddingProvider(self.api_key)
-        
+            http_client, http_async_client = self._get_http_clients()
+            self._embedding_provider = EmbeddingProvider(
+                self.api_key,
+                http_client=http_client,
+                http_async_client=http_async_client
+            )
+
         return self._embedding_provider
     
     def configure_llm(self, **kwargs) -> None:
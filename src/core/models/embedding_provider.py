@@ -7,7 +7,9 @@ Responsible for:
 - Performance optimization for batch operations
 """
 
+import asyncio
 import os
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from langchain_openai import OpenAIEmbeddings
 
@@ -20,34 +22,50 @@ class EmbeddingProvider:
     document vectorization and query embedding generation.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 http_client=None, http_async_client=None):
         """
         Initialize the embedding provider.
-        
+
         Args:
             api_key: OpenAI API key. If None, uses environment variable.
+            http_client: Optional shared httpx.Client for connection reuse
+            http_async_client: Optional shared httpx.AsyncClient
         """
-        if api_key:
-            os.environ["OPENAI_API_KEY"] = api_key
-        elif not os.environ.get("OPENAI_API_KEY"):
+        if not api_key and not os.environ.get("OPENAI_API_KEY"):
             raise ValueError("OpenAI API key is required.")
-        
+
+        # Kept per-instance (not written to os.environ) so engines with
+        # different keys can run concurrently in one process
+        self._api_key = api_key
         self._embeddings = None
+        self._http_client = http_client
+        self._http_async_client = http_async_client
         self._model_config = {
             "model": "text-embedding-3-small",
-            "chunk_size": 1000  # For batch processing
+            "chunk_size": 512  # Texts per embedding API request
         }
-    
+        # Per-instance LRU: repeated identical queries in a session skip
+        # the embedding API round-trip entirely
+        self._embed_query_cached = lru_cache(maxsize=256)(self._embed_query_uncached)
+
     def get_embeddings(self) -> OpenAIEmbeddings:
         """
         Get the configured embedding model instance.
-        
+
         Returns:
             OpenAIEmbeddings: Configured embedding model
         """
         if self._embeddings is None:
-            self._embeddings = OpenAIEmbeddings(**self._model_config)
-        
+            kwargs = dict(self._model_config)
+            if self._api_key:
+                kwargs["api_key"] = self._api_key
+            if self._http_client is not None:
+                kwargs["http_client"] = self._http_client
+            if self._http_async_client is not None:
+                kwargs["http_async_client"] = self._http_async_client
+            self._embeddings = OpenAIEmbeddings(**kwargs)
+
         return self._embeddings
     
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
@@ -62,19 +80,65 @@ class EmbeddingProvider:
         """
         embeddings_model = self.get_embeddings()
         return embeddings_model.embed_documents(texts)
-    
+
+    def embed_documents_batched(self, texts: List[str],
+                                batch_size: int = 256,
+                                max_concurrency: int = 8) -> List[List[float]]:
+        """
+        Generate embeddings with concurrent batched API requests.
+
+        Large ingests are dominated by network round-trips; splitting the
+        texts into batches and embedding them concurrently overlaps that
+        latency instead of paying it serially. Falls back to the plain
+        sequential path when already inside a running event loop.
+
+        Args:
+            texts: List of document texts to embed
+            batch_size: Number of texts per API request
+            max_concurrency: Maximum number of in-flight requests
+
+        Returns:
+            List of embedding vectors in input order
+        """
+        if len(texts) <= batch_size:
+            return self.embed_documents(texts)
+
+        embeddings_model = self.get_embeddings()
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        async def _embed_all():
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def _embed_batch(batch):
+                async with semaphore:
+                    return await embeddings_model.aembed_documents(batch)
+
+            return await asyncio.gather(*(_embed_batch(batch) for batch in batches))
+
+        try:
+            results = asyncio.run(_embed_all())
+        except RuntimeError:
+            # Already inside an event loop (e.g. async caller); stay sequential
+            return self.embed_documents(texts)
+
+        return [vector for batch in results for vector in batch]
+
+    def _embed_query_uncached(self, text: str) -> List[float]:
+        """Embed a query via the API (wrapped by the per-instance LRU)."""
+        embeddings_model = self.get_embeddings()
+        return embeddings_model.embed_query(text)
+
     def embed_query(self, text: str) -> List[float]:
         """
-        Generate embedding for a single query.
-        
+        Generate embedding for a single query, with an LRU over recent queries.
+
         Args:
             text: Query text to embed
-            
+
         Returns:
             Embedding vector for the query
         """
-        embeddings_model = self.get_embeddings()
-        return embeddings_model.embed_query(text)
+        return self._embed_query_cached(text)
     
     def configure_model(self, **kwargs) -> None:
         """
@@ -86,6 +150,8 @@ class EmbeddingProvider:
         self._model_config.update(kwargs)
         # Reset cached instance to pick up new config
         self._embeddings = None
+        # Cached query vectors came from the old model
+        self._embed_query_cached.cache_clear()
     
     def get_model_info(self) -> Dict[str, Any]:
         """
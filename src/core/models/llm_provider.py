@@ -20,35 +20,48 @@ class LLMProvider:
     a clean interface for other components to access language models.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 http_client=None, http_async_client=None):
         """
         Initialize the LLM provider.
-        
+
         Args:
             api_key: OpenAI API key. If None, uses environment variable.
+            http_client: Optional shared httpx.Client for connection reuse
+            http_async_client: Optional shared httpx.AsyncClient
         """
-        if api_key:
-            os.environ["OPENAI_API_KEY"] = api_key
-        elif not os.environ.get("OPENAI_API_KEY"):
+        if not api_key and not os.environ.get("OPENAI_API_KEY"):
             raise ValueError("OpenAI API key is required.")
-        
+
+        # Kept per-instance (not written to os.environ) so engines with
+        # different keys can run concurrently in one process
+        self._api_key = api_key
         self._llm = None
+        self._http_client = http_client
+        self._http_async_client = http_async_client
         self._model_config = {
             "model": "gpt-4o-mini",
             "temperature": 0.1,
             "max_tokens": 2000
         }
-    
+
     def get_llm(self) -> ChatOpenAI:
         """
         Get the configured language model instance.
-        
+
         Returns:
             ChatOpenAI: Configured language model
         """
         if self._llm is None:
-            self._llm = ChatOpenAI(**self._model_config)
-        
+            kwargs = dict(self._model_config)
+            if self._api_key:
+                kwargs["api_key"] = self._api_key
+            if self._http_client is not None:
+                kwargs["http_client"] = self._http_client
+            if self._http_async_client is not None:
+                kwargs["http_async_client"] = self._http_async_client
+            self._llm = ChatOpenAI(**kwargs)
+
         return self._llm
     
     def configure_model(self, **kwargs) -> None:
@@ -3,19 +3,22 @@ Orchestration Package
 
 This package provides centralized management for AI orchestration operations:
 - RAG Retriever: Retrieval-Augmented Generation query processing
-- Agent Executor: AI agent execution and tool orchestration  
+- Agent Executor: AI agent execution and tool orchestration
 - Tool Registry: Tool registration and management
+- Semantic Cache: Embedding-based response reuse
 - Orchestration Manager: Unified AI orchestration lifecycle management
 """
 
 from .rag_retriever import RAGRetriever
 from .agent_executor import AgentExecutor
 from .tool_registry import ToolRegistry
+from .semantic_cache import SemanticCache
 from .orchestration_manager import OrchestrationManager
 
 __all__ = [
     'RAGRetriever',
-    'AgentExecutor', 
+    'AgentExecutor',
     'ToolRegistry',
+    'SemanticCache',
     'OrchestrationManager'
 ]
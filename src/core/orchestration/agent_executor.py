@@ -8,10 +8,15 @@ Responsible for:
 - Executing agent workflows and conversations
 """
 
+import os
 from typing import List, Dict, Optional, Any
 from langchain.agents import AgentExecutor as LangChainAgentExecutor, create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate
 
+# Verbose agent traces print synchronously on the request path; keep them
+# opt-in for debugging rather than always on.
+AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "").lower() in ("1", "true", "yes")
+
 
 class AgentExecutor:
     """
@@ -45,7 +50,13 @@ class AgentExecutor:
         if not self.tool_registry.is_initialized():
             print("❌ Cannot build agent without initialized tool registry")
             return
-        
+
+        if self.agent_executor is not None:
+            # The prompt is static, so an already-built executor only needs
+            # its tracked file list refreshed
+            self.file_list = file_list or []
+            return
+
         try:
             # Update file list
             self.file_list = file_list or []
@@ -58,17 +69,18 @@ class AgentExecutor:
                 print("❌ No tools available for agent")
                 return
             
-            # Create agent prompt with file list context
-            agent_prompt = self._create_agent_prompt(self.file_list)
+            # Create agent prompt; it is fully static, so the agent never
+            # needs rebuilding when documents change
+            agent_prompt = self._create_agent_prompt()
             
             # Create OpenAI tools agent
             agent = create_openai_tools_agent(llm, tools, agent_prompt)
             
             # Create agent executor
             self.agent_executor = LangChainAgentExecutor(
-                agent=agent, 
-                tools=tools, 
-                verbose=True
+                agent=agent,
+                tools=tools,
+                verbose=AGENT_VERBOSE
             )
             
             self._is_initialized = True
@@ -79,34 +91,35 @@ class AgentExecutor:
             self.agent_executor = None
             self._is_initialized = False
     
-    def _create_agent_prompt(self, file_list: List[str]) -> ChatPromptTemplate:
+    def _create_agent_prompt(self) -> ChatPromptTemplate:
         """
-        Create the agent system prompt with file list context.
-        
-        Args:
-            file_list: List of files in the knowledge base
-            
+        Create the agent system prompt.
+
+        The prompt is fully static — the agent discovers the current file
+        list through the list_files tool — so the prompt prefix stays
+        byte-identical across turns and knowledge base changes, preserving
+        provider-side prompt cache hits.
+
         Returns:
             ChatPromptTemplate for the agent
         """
-        # Format file list for prompt
-        file_list_str = ", ".join(file_list) if file_list else "No files uploaded yet"
-        
         # Create system prompt with operational guide
-        system_prompt = f"""
+        system_prompt = """
 You are an expert AI assistant specializing in Communication Engineering.
 Your primary goal is to assist users by analyzing technical documents and performing relevant calculations.
-You have access to a specialized set of tools to help you. The user has uploaded the following files: {file_list_str}
+You have access to a specialized set of tools to help you.
 
 Here is your operational guide:
 
-1.  **For General Questions**: Use the `knowledge_base_qa` tool to answer questions about the contents of the documents. This is your primary tool for information retrieval.
+1.  **For File Discovery**: Use the `list_files` tool to see which documents the user has uploaded. Call it whenever you need an exact file name for another tool.
 
-2.  **For Summarization**: Use the `summarize_document` tool ONLY when the user explicitly asks for a summary of a specific file.
+2.  **For General Questions**: Use the `knowledge_base_qa` tool to answer questions about the contents of the documents. This is your primary tool for information retrieval.
 
-3.  **For Calculations (e.g., Link Budget)**: This is a multi-step process.
+3.  **For Summarization**: Use the `summarize_document` tool ONLY when the user explicitly asks for a summary of a specific file.
+
+4.  **For Calculations (e.g., Link Budget)**: This is a multi-step process.
     *   **Step A: Identify Parameters**: First, understand what parameters are needed for the calculation (e.g., for a link budget, you need distance, power, gain, loss, frequency).
-    *   **Step B: Gather Data**: If the user has not provided all parameters, use the `extract_technical_specifications` tool to find the missing information from the uploaded documents. You may need to call this tool multiple times for different documents.
+    *   **Step B: Gather Data**: If the user has not provided all parameters, use the `extract_technical_specifications_batch` tool to find the missing information from all relevant documents in one call. Use the single-file `extract_technical_specifications` tool only for targeted follow-ups on one document.
     *   **Step C: Execute Calculation**: Once you have all the necessary parameters, use the `calculate_link_budget` tool to perform the calculation.
     *   **Step D: Present Results**: Clearly present the final calculated results to the user and, if helpful, list the parameters used to get there.
 
@@ -141,7 +154,7 @@ Always be professional, concise, and when possible, cite the source document for
                 "input": query,
                 "chat_history": chat_history or []
             }
-            
+
             # Execute agent
             response = self.agent_executor.invoke(agent_input)
             
@@ -157,10 +170,46 @@ Always be professional, concise, and when possible, cite the source document for
             print(f"❌ Error in agent execution: {str(e)}")
             return f"❌ Error processing query: {str(e)}"
     
+    async def aexecute(self, query: str, chat_history: List = None) -> str:
+        """
+        Execute a query through the agent asynchronously.
+
+        The async path lets callers await the agent without tying up a
+        worker thread while the LLM round-trips are in flight.
+
+        Args:
+            query: User query to process
+            chat_history: Optional chat history for context
+
+        Returns:
+            Agent response string
+        """
+        if not self._is_initialized or not self.agent_executor:
+            return "❌ Agent executor not initialized. Please ensure tools and knowledge base are available."
+
+        try:
+            agent_input = {
+                "input": query,
+                "chat_history": chat_history or []
+            }
+
+            response = await self.agent_executor.ainvoke(agent_input)
+
+            if isinstance(response, dict) and "output" in response:
+                return response["output"]
+            elif isinstance(response, str):
+                return response
+            else:
+                return str(response)
+
+        except Exception as e:
+            print(f"❌ Error in agent execution: {str(e)}")
+            return f"❌ Error processing query: {str(e)}"
+
     def is_ready(self) -> bool:
         """
         Check if agent executor is ready for queries.
-        
+
         Returns:
             True if agent is initialized and ready
         """
@@ -205,20 +254,24 @@ Always be professional, concise, and when possible, cite the source document for
     
     def update_file_list(self, file_list: List[str]) -> bool:
         """
-        Update the file list and rebuild agent if necessary.
-        
+        Update the file list tracked for agent metadata.
+
+        The agent reads the live list through the list_files tool, so no
+        rebuild (or prompt change) is needed.
+
         Args:
             file_list: New list of files in the knowledge base
-            
+
         Returns:
             True if update was successful
         """
         if self.file_list == file_list:
             # No change needed
             return True
-        
+
         print(f"📝 Updating file list: {len(file_list)} files")
-        return self.rebuild_agent(file_list)
+        self.file_list = list(file_list)
+        return True
     
     def execute_with_streaming(self, query: str, chat_history: List = None):
         """
@@ -241,7 +294,7 @@ Always be professional, concise, and when possible, cite the source document for
                 "input": query,
                 "chat_history": chat_history or []
             }
-            
+
             # Check if agent supports streaming
             if hasattr(self.agent_executor, 'stream'):
                 for chunk in self.agent_executor.stream(agent_input):
@@ -114,6 +114,41 @@ class OrchestrationManager:
             print(f"❌ Error processing query in {processing_mode} mode: {str(e)}")
             return f"❌ Error processing query: {str(e)}"
     
+    async def aprocess_query(self, query: str, chat_history: List = None,
+                             mode: str = None) -> str:
+        """
+        Process a user query asynchronously.
+
+        Mirrors process_query but awaits the underlying chains, so several
+        queries can be in flight concurrently without blocking threads.
+
+        Args:
+            query: User query to process
+            chat_history: Optional chat history for context
+            mode: Optional processing mode ("agent" or "rag")
+
+        Returns:
+            Processed response string
+        """
+        if not self._is_initialized:
+            return "❌ Orchestration system not initialized. Please check configuration."
+
+        processing_mode = mode or self._conversation_mode
+
+        try:
+            if processing_mode == "rag":
+                if not self.rag_retriever.is_ready():
+                    return "❌ RAG system not available. Please ensure knowledge base is initialized."
+                return await self.rag_retriever.aquery(query, chat_history)
+            else:
+                if not self.agent_executor.is_ready():
+                    return "❌ Agent system not available. Please ensure tools and knowledge base are initialized."
+                return await self.agent_executor.aexecute(query, chat_history)
+
+        except Exception as e:
+            print(f"❌ Error processing query in {processing_mode} mode: {str(e)}")
+            return f"❌ Error processing query: {str(e)}"
+
     def _process_rag_query(self, query: str, chat_history: List = None) -> str:
         """
         Process query using RAG retrieval only.
@@ -222,10 +257,14 @@ class OrchestrationManager:
             # Refresh RAG retriever
             if self.knowledge_base_manager.is_initialized():
                 self.rag_retriever.rebuild_chain()
-            
-            # Refresh agent executor with updated file list
+
+            # The agent prompt is static; only the tracked file list needs
+            # updating, no executor rebuild
             file_list = self.knowledge_base_manager.get_file_names()
-            self.agent_executor.rebuild_agent(file_list)
+            if self.agent_executor.is_ready():
+                self.agent_executor.update_file_list(file_list)
+            else:
+                self.agent_executor.build_agent(file_list)
             
             print("✅ Conversation components refreshed")
             return True
@@ -13,6 +13,16 @@ from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
 
+from .semantic_cache import SemanticCache
+
+# Built once at import: rebuilding the chain must not re-allocate the template
+_QA_PROMPT = ChatPromptTemplate.from_template("""
+Answer the user's question based only on the following context:
+{context}
+
+Question: {input}
+""")
+
 
 class RAGRetriever:
     """
@@ -33,6 +43,7 @@ class RAGRetriever:
         self.ai_model_manager = ai_model_manager
         self.knowledge_base_manager = knowledge_base_manager
         self.rag_chain = None
+        self._semantic_cache: Optional[SemanticCache] = None
         self._is_initialized = False
     
     def build_rag_chain(self) -> None:
@@ -47,27 +58,28 @@ class RAGRetriever:
             return
         
         try:
-            # Get retriever from knowledge base
+            # Get retriever from knowledge base. MMR trades a slightly wider
+            # candidate fetch for diversity, so the context window isn't
+            # spent on redundant chunks of the same passage.
             retriever = self.knowledge_base_manager.get_vector_store_retriever(
-                search_kwargs={"k": 8}
+                search_kwargs={"k": 4, "fetch_k": 32, "lambda_mult": 0.5},
+                search_type="mmr"
             )
             
-            # Create QA prompt template
-            qa_prompt = ChatPromptTemplate.from_template("""
-Answer the user's question based only on the following context:
-{context}
-
-Question: {input}
-""")
-            
             # Get LLM from AI model manager
             llm = self.ai_model_manager.get_llm_provider().get_llm()
-            
+
             # Create document combination chain
-            question_answer_chain = create_stuff_documents_chain(llm, qa_prompt)
+            question_answer_chain = create_stuff_documents_chain(llm, _QA_PROMPT)
             
             # Create retrieval chain
             self.rag_chain = create_retrieval_chain(retriever, question_answer_chain)
+
+            # Fresh semantic cache: answers from a previous chain (or an
+            # older knowledge base state) must not be served
+            self._semantic_cache = SemanticCache(
+                self.ai_model_manager.get_embedding_provider().embed_query
+            )
             self._is_initialized = True
             
             print("✅ RAG chain built successfully")
@@ -94,28 +106,71 @@ Question: {input}
         try:
             # Prepare input for RAG chain
             rag_input = {"input": question}
-            
+
             # Add chat history if provided
             if chat_history:
                 # Convert chat history to string context if needed
                 history_context = self._format_chat_history(chat_history)
                 rag_input["chat_history"] = history_context
-            
+            elif self._semantic_cache:
+                # History-free questions can reuse answers to semantically
+                # equivalent past questions
+                cached_answer = self._semantic_cache.lookup(question)
+                if cached_answer is not None:
+                    return cached_answer
+
             # Execute RAG chain
             response = self.rag_chain.invoke(rag_input)
-            
+
             # Extract answer from response
+            if isinstance(response, dict) and "answer" in response:
+                answer = response["answer"]
+            elif isinstance(response, str):
+                answer = response
+            else:
+                answer = str(response)
+
+            if not chat_history and self._semantic_cache:
+                self._semantic_cache.store(question, answer)
+
+            return answer
+                
+        except Exception as e:
+            print(f"❌ Error in RAG query: {str(e)}")
+            return f"❌ Error processing query: {str(e)}"
+    
+    async def aquery(self, question: str, chat_history: List = None) -> str:
+        """
+        Execute a RAG query asynchronously.
+
+        Args:
+            question: User question to answer
+            chat_history: Optional chat history for context
+
+        Returns:
+            RAG-augmented response string
+        """
+        if not self._is_initialized or not self.rag_chain:
+            return "❌ RAG system not initialized. Please ensure knowledge base is available."
+
+        try:
+            rag_input = {"input": question}
+            if chat_history:
+                rag_input["chat_history"] = self._format_chat_history(chat_history)
+
+            response = await self.rag_chain.ainvoke(rag_input)
+
             if isinstance(response, dict) and "answer" in response:
                 return response["answer"]
             elif isinstance(response, str):
                 return response
             else:
                 return str(response)
-                
+
         except Exception as e:
             print(f"❌ Error in RAG query: {str(e)}")
             return f"❌ Error processing query: {str(e)}"
-    
+
     def _format_chat_history(self, chat_history: List) -> str:
         """
         Format chat history for RAG context.
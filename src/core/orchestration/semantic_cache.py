@@ -0,0 +1,92 @@
+"""
+Semantic Cache - Embedding-Based Response Reuse
+
+Responsible for:
+- Caching query responses keyed by query embedding
+- Serving near-duplicate questions without re-running the RAG chain
+"""
+
+from typing import Callable, List, Optional
+
+import faiss
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Caches responses under query embeddings and serves semantic near-hits.
+
+    Paraphrased repeats of a question ("what's the antenna gain" vs "what
+    is the gain of the antenna") embed almost identically; a small inner-
+    product index over past query vectors finds them and returns the
+    stored answer, skipping retrieval and generation entirely. The cache
+    is session-scoped and must be cleared when the knowledge base changes.
+    """
+
+    def __init__(self, embed_query: Callable[[str], List[float]],
+                 similarity_threshold: float = 0.97,
+                 max_entries: int = 256):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embed_query: Function mapping a query string to its embedding
+            similarity_threshold: Minimum cosine similarity to count as a hit
+            max_entries: Cache capacity; the cache resets when exceeded
+        """
+        self._embed_query = embed_query
+        self._similarity_threshold = similarity_threshold
+        self._max_entries = max_entries
+        self._index: Optional[faiss.Index] = None
+        self._responses: List[str] = []
+
+    def _embed(self, question: str) -> np.ndarray:
+        vector = np.asarray([self._embed_query(question)], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, question: str) -> Optional[str]:
+        """
+        Look up a cached response for a semantically equivalent question.
+
+        Args:
+            question: Incoming user question
+
+        Returns:
+            Cached response string, or None on a miss
+        """
+        if self._index is None or self._index.ntotal == 0:
+            return None
+
+        scores, indices = self._index.search(self._embed(question), 1)
+        if scores[0][0] >= self._similarity_threshold:
+            print(f"⚡ Semantic cache hit (similarity {scores[0][0]:.3f})")
+            return self._responses[int(indices[0][0])]
+
+        return None
+
+    def store(self, question: str, response: str) -> None:
+        """
+        Cache a response under the question's embedding.
+
+        Args:
+            question: Question that produced the response
+            response: Response to reuse for near-duplicate questions
+        """
+        vector = self._embed(question)
+
+        if self._index is None:
+            self._index = faiss.IndexFlatIP(vector.shape[1])
+        elif self._index.ntotal >= self._max_entries:
+            # Simple bounded behavior: start over rather than evicting
+            self._index.reset()
+            self._responses = []
+
+        self._index.add(vector)
+        self._responses.append(response)
+
+    def clear(self) -> None:
+        """Drop all cached entries (call after knowledge base updates)."""
+        if self._index is not None:
+            self._index.reset()
+        self._responses = []
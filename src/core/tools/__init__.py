@@ -6,9 +6,13 @@ This module provides centralized access to all agent tools and manages their ins
 from typing import TYPE_CHECKING, List
 
 from .knowledge_base.knowledge_qa import create_knowledge_base_qa_tool
+from .knowledge_base.file_lister import create_list_files_tool
 from .document.document_summarizer import create_summarize_document_tool
-from .extractors.technical_spec_extractor import create_tech_spec_extractor_tool
-from .calculators.link_budget_calculator import calculate_link_budget
+from .extractors.technical_spec_extractor import (
+    create_tech_spec_extractor_tool,
+    create_tech_spec_batch_extractor_tool,
+)
+from .calculators.link_budget_calculator import calculate_link_budget, calculate_link_budget_sweep
 
 if TYPE_CHECKING:
     from ..agent_system import AgentEngine
@@ -28,7 +32,10 @@ def create_all_tools(engine: "AgentEngine") -> List:
         create_knowledge_base_qa_tool(engine),
         create_summarize_document_tool(engine),
         create_tech_spec_extractor_tool(engine),
-        calculate_link_budget  # This tool is stateless, no binding needed
+        create_tech_spec_batch_extractor_tool(engine),
+        calculate_link_budget,  # This tool is stateless, no binding needed
+        calculate_link_budget_sweep,  # Stateless as well
+        create_list_files_tool(engine)
     ]
 
 
@@ -36,7 +43,10 @@ def create_all_tools(engine: "AgentEngine") -> List:
 __all__ = [
     'create_all_tools',
     'create_knowledge_base_qa_tool',
+    'create_list_files_tool',
     'create_summarize_document_tool', 
     'create_tech_spec_extractor_tool',
-    'calculate_link_budget'
+    'create_tech_spec_batch_extractor_tool',
+    'calculate_link_budget',
+    'calculate_link_budget_sweep'
 ]
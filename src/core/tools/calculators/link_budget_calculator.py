@@ -4,9 +4,10 @@ Link Budget Calculator Tool
 This tool performs point-to-point communication link budget calculations.
 """
 import math
+import numpy as np
 from langchain.tools import tool
 from pydantic.v1 import BaseModel, Field
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class LinkBudgetInput(BaseModel):
@@ -52,3 +53,49 @@ def calculate_link_budget(
         # Note: True Link Margin requires Receiver Sensitivity, which the user must provide for the final comparison.
         # The agent will need to compare this received power with the sensitivity.
     }
+
+
+class LinkBudgetSweepInput(BaseModel):
+    distances_km: List[float] = Field(description="The list of distances to evaluate, in kilometers.")
+    transmitter_power_dBm: float = Field(description="The output power of the transmitter in dBm.")
+    transmitter_cable_loss_dB: float = Field(description="The cable and connector loss at the transmitter side in dB.")
+    transmitter_antenna_gain_dBi: float = Field(description="The gain of the transmitter's antenna in dBi.")
+    receiver_antenna_gain_dBi: float = Field(description="The gain of the receiver's antenna in dBi.")
+    receiver_cable_loss_dB: float = Field(description="The cable and connector loss at the receiver side in dB.")
+    frequency_MHz: float = Field(description="The operating frequency in Megahertz.")
+
+
+@tool(args_schema=LinkBudgetSweepInput)
+def calculate_link_budget_sweep(
+    distances_km: List[float],
+    transmitter_power_dBm: float,
+    transmitter_cable_loss_dB: float,
+    transmitter_antenna_gain_dBi: float,
+    receiver_antenna_gain_dBi: float,
+    receiver_cable_loss_dB: float,
+    frequency_MHz: float
+) -> Dict[str, Any]:
+    """
+    Calculates the link budget over a list of distances in a single call.
+    Use this instead of calling calculate_link_budget repeatedly when the user
+    asks how the link behaves across several distances or a coverage range.
+    Returns per-distance FSPL and received power values plus the shared EIRP.
+    """
+    # One vectorized pass over all distances instead of a tool call per point
+    distances = np.asarray(distances_km, dtype=np.float64)
+
+    eirp_dBm = transmitter_power_dBm - transmitter_cable_loss_dB + transmitter_antenna_gain_dBi
+    fspl_dB = 20 * np.log10(distances) + 20 * math.log10(frequency_MHz) + 27.55
+    received_power_dBm = eirp_dBm - fspl_dB + receiver_antenna_gain_dBi - receiver_cable_loss_dB
+
+    return {
+        "Effective Isotropic Radiated Power (EIRP) dBm": round(eirp_dBm, 2),
+        "Results per distance": [
+            {
+                "Distance km": float(distance),
+                "Free Space Path Loss (FSPL) dB": round(float(fspl), 2),
+                "Calculated Received Power dBm": round(float(power), 2)
+            }
+            for distance, fspl, power in zip(distances, fspl_dB, received_power_dBm)
+        ]
+    }
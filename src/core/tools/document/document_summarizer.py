@@ -3,6 +3,9 @@ Document Summarization Tool
 
 This tool provides multi-language document summarization capabilities.
 """
+import hashlib
+from functools import lru_cache
+
 from langchain.tools import tool
 from langchain_core.messages import SystemMessage, HumanMessage
 from pydantic.v1 import BaseModel, Field
@@ -11,6 +14,26 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ...agent_system import AgentEngine
 
+# Input budget in tokens. A character slice under-fills the budget for
+# English and blows it for CJK; counting tokens makes it deterministic.
+SUMMARY_TOKEN_BUDGET = 12_000
+
+
+@lru_cache(maxsize=None)
+def _token_encoding():
+    """Cached tiktoken encoding for the summarization model."""
+    import tiktoken
+    return tiktoken.encoding_for_model("gpt-4o-mini")
+
+
+def _truncate_to_tokens(text: str, budget: int = SUMMARY_TOKEN_BUDGET) -> str:
+    """Clip text to a fixed token budget, leaving short texts untouched."""
+    enc = _token_encoding()
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= budget:
+        return text
+    return enc.decode(ids[:budget])
+
 
 class SummarizeInput(BaseModel):
     file_name: str = Field(description="The exact file name of the document to summarize.")
@@ -41,8 +64,17 @@ def create_summarize_document_tool(engine: "AgentEngine"):
         if file_name not in engine.raw_texts:
             return f"Error: The file '{file_name}' was not found in the knowledge base. Please use one of the available files: {', '.join(engine.file_names)}"
         
-        text_to_summarize = engine.raw_texts[file_name]
-        
+        text_to_summarize = _truncate_to_tokens(engine.raw_texts[file_name])
+
+        # Cache by content hash + language: re-summarizing unchanged text in
+        # the same language is a dictionary lookup, not an LLM call
+        content_digest = hashlib.sha256(text_to_summarize.encode("utf-8")).hexdigest()
+        cache_key = f"{content_digest}:{language.strip().lower()}"
+        cached_summary = engine.get_cached_summary(cache_key)
+        if cached_summary is not None:
+            print(f"⚡ Summary cache hit for '{file_name}' ({language})")
+            return cached_summary
+
         # Enhanced language-specific prompt with stronger enforcement
         language_instruction = f"""
 ABSOLUTE CRITICAL LANGUAGE REQUIREMENT: 
@@ -79,7 +111,7 @@ Do not use any other language in your response.
 Document: {file_name}
 
 Content:
-{text_to_summarize[:16000]}
+{text_to_summarize}
 
 Remember: Respond entirely in {language}."""
         
@@ -87,6 +119,7 @@ Remember: Respond entirely in {language}."""
             SystemMessage(content=system_prompt),
             HumanMessage(content=human_prompt)
         ])
+        engine.cache_summary(cache_key, response.content)
         return response.content
     
     return summarize_document
@@ -4,6 +4,12 @@ Technical Specification Extraction Tool
 This tool extracts specific technical parameters from documents using structured output.
 """
 import json
+
+try:
+    import orjson  # Noticeably faster parsing for large JSON payloads
+except ImportError:
+    orjson = None
+
 from langchain.tools import tool
 from langchain_core.messages import HumanMessage
 from pydantic.v1 import BaseModel, Field
@@ -21,6 +27,11 @@ class TechSpecInput(DocumentInput):
     parameters_to_extract: List[str] = Field(description="A list of specific technical parameters to extract from the document.")
 
 
+class TechSpecBatchInput(BaseModel):
+    file_names: List[str] = Field(description="The exact file names of all documents to process in one pass.")
+    parameters_to_extract: List[str] = Field(description="A list of specific technical parameters to extract from each document.")
+
+
 def create_tech_spec_extractor_tool(engine: "AgentEngine"):
     """
     Factory function to create an extract_technical_specifications tool bound to a specific engine instance.
@@ -63,9 +74,70 @@ def create_tech_spec_extractor_tool(engine: "AgentEngine"):
         
         try:
             response = json_llm.invoke([HumanMessage(content=extraction_prompt)])
-            extracted_data = json.loads(response.content)
+            if orjson is not None:
+                extracted_data = orjson.loads(response.content)
+            else:
+                extracted_data = json.loads(response.content)
             return extracted_data
         except Exception as e:
             return {"error": f"Failed to extract or parse data for {file_name}. Reason: {e}"}
-    
+
     return extract_technical_specifications
+
+
+def create_tech_spec_batch_extractor_tool(engine: "AgentEngine"):
+    """
+    Factory function to create an extract_technical_specifications_batch tool bound to a specific engine instance.
+
+    Args:
+        engine: The AgentEngine instance containing the raw texts and LLM
+
+    Returns:
+        The configured extract_technical_specifications_batch tool
+    """
+
+    @tool(args_schema=TechSpecBatchInput)
+    def extract_technical_specifications_batch(file_names: List[str], parameters_to_extract: List[str]) -> Dict[str, Any]:
+        """
+        Extracts the same technical parameters from several documents in a single call.
+        Prefer this over calling extract_technical_specifications once per file when
+        gathering data (e.g. a link budget) from multiple spec sheets.
+        Returns a JSON object mapping each file name to its extracted parameters.
+        """
+        missing = [name for name in file_names if name not in engine.raw_texts]
+        if missing:
+            return {"error": f"The files {', '.join(missing)} were not found. Available files: {', '.join(engine.file_names)}"}
+
+        # One prompt covering all documents: a single LLM round-trip instead
+        # of one blocking call per file
+        document_blocks = "\n".join(
+            f"---\nFILE: {name}\n{engine.raw_texts[name][:8000]}\n---"
+            for name in file_names
+        )
+
+        json_llm = engine.llm.bind(response_format={"type": "json_object"})
+
+        extraction_prompt = f"""
+        For each document below, extract the values for the following parameters:
+        {', '.join(parameters_to_extract)}
+
+        Please return the result as a JSON object where the keys are the file names and
+        each value is an object mapping parameter names to extracted values.
+        If a parameter is not found in a document, its value should be null.
+        Only return the JSON object, with no other text.
+
+        Documents:
+        {document_blocks}
+        """
+
+        try:
+            response = json_llm.invoke([HumanMessage(content=extraction_prompt)])
+            if orjson is not None:
+                extracted_data = orjson.loads(response.content)
+            else:
+                extracted_data = json.loads(response.content)
+            return extracted_data
+        except Exception as e:
+            return {"error": f"Failed to extract or parse data for {', '.join(file_names)}. Reason: {e}"}
+
+    return extract_technical_specifications_batch
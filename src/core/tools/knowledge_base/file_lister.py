@@ -0,0 +1,39 @@
+"""
+File Listing Tool
+
+This tool lets the agent discover which documents are in the knowledge base
+without the file list living in the system prompt.
+"""
+from langchain.tools import tool
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...agent_system import AgentEngine
+
+
+def create_list_files_tool(engine: "AgentEngine"):
+    """
+    Factory function to create a list_files tool bound to a specific engine instance.
+
+    Keeping the file list behind a tool (instead of templated into the system
+    prompt) keeps the prompt prefix byte-identical across turns and knowledge
+    base changes, which preserves provider-side prompt cache hits.
+
+    Args:
+        engine: The AgentEngine instance holding the current file names
+
+    Returns:
+        The configured list_files tool
+    """
+
+    @tool
+    def list_files() -> str:
+        """
+        Use this tool to see the exact file names of all documents currently in the knowledge base.
+        Call it whenever you need a file name for another tool (e.g. summarization or extraction).
+        """
+        if not engine.file_names:
+            return "No files have been uploaded yet."
+        return ", ".join(engine.file_names)
+
+    return list_files
@@ -13,7 +13,8 @@ This structure will support the future multi-layer navigation system.
 from .chat import render_chat_messages, handle_chat_input
 from .upload import (
     render_initial_upload_section,
-    render_add_documents_section
+    render_add_documents_section,
+    render_ingest_status
 )
 from .knowledge_base import (
     render_knowledge_base_section,
@@ -27,8 +28,9 @@ __all__ = [
     'handle_chat_input',
     
     # Upload components
-    'render_initial_upload_section', 
+    'render_initial_upload_section',
     'render_add_documents_section',
+    'render_ingest_status',
     
     # Knowledge base components
     'render_knowledge_base_section',
@@ -7,19 +7,100 @@ Contains all components related to chat functionality:
 - Message history management
 """
 
+import html as html_lib
+
 import streamlit as st
 from langchain_core.messages import AIMessage, HumanMessage
 from typing import Optional, List
 
+# Optional fast path: pre-render settled AI messages to HTML once in
+# Python instead of re-running the frontend markdown pipeline per rerun
+try:
+    from markdown_it import MarkdownIt
+    # html=False matches st.markdown's escaping semantics: raw HTML in a
+    # message (e.g. document content quoted by a RAG answer) is rendered
+    # as text, never injected into the page
+    _md_renderer = MarkdownIt("commonmark", {"html": False}).enable("table")
+except ImportError:
+    _md_renderer = None
+
+
+def _message_html(message, html_cache: dict) -> Optional[str]:
+    """Cached HTML bubble for one settled message (None if unsupported)."""
+    key = id(message)
+    cached = html_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if isinstance(message, AIMessage):
+        body = _md_renderer.render(message.content)
+        rendered = (
+            '<div class="chat-msg ai"><span class="avatar">🤖</span>'
+            f'<div class="body">{body}</div></div>'
+        )
+    elif isinstance(message, HumanMessage):
+        body = html_lib.escape(message.content)
+        rendered = (
+            '<div class="chat-msg user"><span class="avatar">🧑‍💻</span>'
+            f'<div class="body">{body}</div></div>'
+        )
+    else:
+        return None
+
+    html_cache[key] = rendered
+    return rendered
+
+
 def render_chat_messages(chat_history: List):
     """Render the chat message history."""
-    for message in chat_history:
+    if _md_renderer is None or not hasattr(st, "html"):
+        _render_messages_individually(chat_history)
+        return
+
+    # Settled messages (all but the newest) collapse into a single
+    # st.html flush: one delta and one DOM patch regardless of history
+    # length. The newest message keeps the normal widget path so an
+    # in-flight response still updates incrementally.
+    html_cache = st.session_state.setdefault("rendered_html", {})
+    live_keys = set()
+    parts = []
+    for message in chat_history[:-1]:
+        rendered = _message_html(message, html_cache)
+        if rendered is not None:
+            live_keys.add(id(message))
+            parts.append(rendered)
+
+    if parts:
+        st.html("".join(parts))
+
+    if chat_history:
+        message = chat_history[-1]
         if isinstance(message, AIMessage):
             with st.chat_message("ai", avatar="🤖"):
                 st.markdown(message.content)
         elif isinstance(message, HumanMessage):
             with st.chat_message("user", avatar="🧑‍💻"):
+                st.text(message.content)
+
+    # Drop cached HTML for messages no longer in the history (id() values
+    # can be recycled once a message is garbage collected)
+    if len(html_cache) > len(live_keys):
+        for key in list(html_cache):
+            if key not in live_keys:
+                del html_cache[key]
+
+
+def _render_messages_individually(chat_history: List):
+    """Per-message widget fallback for older Streamlit / no markdown-it."""
+    for message in chat_history:
+        if isinstance(message, AIMessage):
+            with st.chat_message("ai", avatar="🤖"):
                 st.markdown(message.content)
+        elif isinstance(message, HumanMessage):
+            with st.chat_message("user", avatar="🧑‍💻"):
+                # Plain user text: st.text skips the markdown pipeline
+                # (and stops user input being interpreted as markup)
+                st.text(message.content)
 
 def handle_chat_input(prompt: str, chat_engine, chat_history: List) -> Optional[str]:
     """
@@ -36,11 +117,18 @@ def handle_chat_input(prompt: str, chat_engine, chat_history: List) -> Optional[
     if not st.session_state.get("kb_initialized"):
         st.error("Please create a knowledge base first using the sidebar.")
         return None
-        
+
+    # The ingestion worker mutates the live FAISS index; concurrent
+    # searches against it are not thread-safe, so queries wait it out
+    job = st.session_state.get("ingest_job")
+    if job is not None and not job["done"]:
+        st.warning("⏳ Documents are still being ingested. Please try again in a moment.")
+        return None
+
     chat_history.append(HumanMessage(content=prompt))
     
     with st.chat_message("user", avatar="🧑‍💻"):
-        st.write(prompt)
+        st.text(prompt)
 
     with st.chat_message("AI", avatar="🤖"):
         with st.spinner("Thinking..."):
@@ -0,0 +1,21 @@
+"""
+Shared UI Helpers
+
+Small utilities used across the UI components.
+"""
+
+import streamlit as st
+
+
+def rerun_app():
+    """
+    Rerun the whole script, not just the enclosing fragment.
+
+    Used after state changes that other panels must pick up (new chat
+    messages, knowledge base mutations). Falls back to a plain rerun on
+    Streamlit versions without fragment scopes.
+    """
+    try:
+        st.rerun(scope="app")
+    except TypeError:
+        st.rerun()
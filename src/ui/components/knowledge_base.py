@@ -8,8 +8,57 @@ Contains all components related to knowledge base management:
 """
 
 import streamlit as st
+from functools import lru_cache
 from langchain_core.messages import AIMessage
 from typing import List
+from .common import rerun_app
+from ...core.session import reset_knowledge_base
+
+
+def _ingest_in_progress() -> bool:
+    """True while a background ingestion job is mutating the index."""
+    job = st.session_state.get("ingest_job")
+    return job is not None and not job["done"]
+
+
+@lru_cache(maxsize=4096)
+def _widget_keys(file_name: str):
+    """Per-file widget labels/keys, built once instead of per rerun."""
+    return (
+        f"📄 {file_name}",
+        f"lang_{file_name}",
+        f"summary_{file_name}",
+        f"delete_{file_name}",
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _cached_summary(file_name: str, language: str, content_key: str, _chat_engine=None) -> str:
+    """
+    Memo for document summaries, keyed on the file's content digest.
+
+    st.cache_data is process-global (it outlives session resets and is
+    shared across sessions), so the key must identify the content itself
+    rather than counters that restart per engine; the engine is passed
+    with a leading underscore so Streamlit skips hashing it.
+    """
+    return _chat_engine.summarize_document.invoke(
+        {"file_name": file_name, "language": language}
+    )
+
+
+def _summary_content_key(chat_engine, file_name: str) -> str:
+    """
+    Content digest of a file, for use as a summary cache key.
+
+    Falls back to name plus kb_version for knowledge bases saved before
+    content digests were recorded.
+    """
+    for digest, name in chat_engine.knowledge_base.content_digests.items():
+        if name == file_name:
+            return digest
+    return f"{file_name}:{chat_engine.kb_version}"
+
 
 def render_document_expander(file_name: str, chat_engine, chat_history: List) -> bool:
     """
@@ -23,20 +72,32 @@ def render_document_expander(file_name: str, chat_engine, chat_history: List) ->
     Returns:
         bool: True if the document was deleted, False otherwise
     """
-    with st.expander(f"📄 {file_name}"):
-        language = st.text_input("Summary Language", value="English", key=f"lang_{file_name}")
-        
+    expander_label, lang_key, summary_key, delete_key = _widget_keys(file_name)
+
+    with st.expander(expander_label):
+        language = st.text_input("Summary Language", value="English", key=lang_key)
+
+        # Summaries read engine state and deletes rebuild the index — both
+        # unsafe while the background ingestion worker is mutating them
+        busy = _ingest_in_progress()
+
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("Summarize", key=f"summary_{file_name}", use_container_width=True):
+            if st.button("Summarize", key=summary_key, use_container_width=True,
+                         disabled=busy):
                 with st.spinner(f"Generating summary in {language}..."):
-                    summary = chat_engine.summarize_document.invoke({"file_name": file_name, "language": language})
+                    summary = _cached_summary(
+                        file_name, language,
+                        _summary_content_key(chat_engine, file_name),
+                        _chat_engine=chat_engine,
+                    )
                     summary_message = f"**Summary for `{file_name}` (in {language}):**\n\n{summary}"
                     chat_history.append(AIMessage(content=summary_message))
-                    st.rerun()
+                    rerun_app()  # chat panel must pick up the new message
         
         with col2:
-            if st.button("Delete", key=f"delete_{file_name}", use_container_width=True, type="primary"):
+            if st.button("Delete", key=delete_key, use_container_width=True,
+                         type="primary", disabled=busy):
                 with st.spinner(f"Deleting {file_name} and rebuilding knowledge base..."):
                     chat_engine.delete_document(file_name)
                 
@@ -51,7 +112,7 @@ def render_document_expander(file_name: str, chat_engine, chat_history: List) ->
                         AIMessage(content=f"🗑️ The document **{file_name}** has been successfully deleted from the knowledge base.")
                     )
                 
-                st.rerun()
+                rerun_app()  # chat panel must pick up the new message
                 return True
     return False
 
@@ -75,15 +136,36 @@ def render_knowledge_base_section(chat_engine, chat_history: List):
                 for file_name in chat_engine.file_names:
                     render_document_expander(file_name, chat_engine, chat_history)
         else:
-            # Many files - scrollable container with generous height for expansion
-            base_height = 4 * 70  # Show 4 files at base height
+            # Many files - paginate so each rerun only builds a 4-row
+            # window of widgets instead of one expander per document
+            page_size = 4
+            num_pages = (num_files + page_size - 1) // page_size
+            page = st.session_state.setdefault("kb_page", 0)
+            # Clamp in case deletions shrank the list below the saved page
+            page = min(page, num_pages - 1)
+            st.session_state.kb_page = page
+
+            base_height = page_size * 70
             expansion_buffer = 150  # Generous buffer for expanded content
             container_height = base_height + expansion_buffer
-            
+
+            start = page * page_size
             with st.container(height=container_height):
-                for file_name in chat_engine.file_names:
+                for file_name in chat_engine.file_names[start:start + page_size]:
                     render_document_expander(file_name, chat_engine, chat_history)
 
+            prev_col, label_col, next_col = st.columns([1, 1, 1])
+            if prev_col.button("← Prev", key="kb_prev", disabled=page == 0,
+                               use_container_width=True):
+                st.session_state.kb_page = page - 1
+                st.rerun()
+            label_col.caption(f"Page {page + 1} / {num_pages}")
+            if next_col.button("Next →", key="kb_next",
+                               disabled=page >= num_pages - 1,
+                               use_container_width=True):
+                st.session_state.kb_page = page + 1
+                st.rerun()
+
 def render_reset_section():
     """Render the reset knowledge base section."""
     if st.session_state.get("confirming_reset", False):
@@ -91,9 +173,10 @@ def render_reset_section():
         col1, col2 = st.columns(2)
         
         if col1.button("✅ Yes, Confirm", use_container_width=True, type="primary"):
-            from ...core.session import reset_knowledge_base
             reset_knowledge_base()
-            st.rerun()
+            # The summary memo is process-global, not session state
+            _cached_summary.clear()
+            rerun_app()  # the whole layout changes after a reset
             
         if col2.button("❌ Cancel", use_container_width=True):
             st.session_state.confirming_reset = False
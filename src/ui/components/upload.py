@@ -10,8 +10,137 @@ Contains all components related to file upload functionality:
 import streamlit as st
 import os
 import shutil
-from langchain_core.messages import AIMessage
+import threading
+import time
 from typing import List
+from .common import rerun_app
+
+
+def _start_ingest_job(kind: str, target, files: List):
+    """
+    Run an ingestion call (create_and_save / add_documents) on a daemon
+    thread so the Streamlit script thread stays responsive.
+
+    The job dict is only mutated by the worker and read by the polling
+    renderer, so no locking is needed; `done` flips last.
+    """
+    job = {
+        "kind": kind,
+        "file_names": [f.name for f in files],
+        "result": None,
+        "error": None,
+        "done": False,
+    }
+
+    def _run():
+        try:
+            job["result"] = target(files)
+        except Exception as e:
+            job["error"] = e
+        finally:
+            job["done"] = True
+
+    st.session_state["ingest_job"] = job
+    threading.Thread(target=_run, daemon=True).start()
+
+
+def render_ingest_status(chat_engine, chat_history: List) -> bool:
+    """
+    Poll the background ingestion job, reporting completion into chat.
+
+    Returns True while a job is still running so callers can avoid
+    starting a second one.
+    """
+    from langchain_core.messages import AIMessage
+
+    job = st.session_state.get("ingest_job")
+    if job is None:
+        return False
+
+    if not job["done"]:
+        verb = ("Creating knowledge base from" if job["kind"] == "create"
+                else "Adding")
+        st.info(f"⏳ {verb} {len(job['file_names'])} document(s)... "
+                "chat and document actions resume when this finishes.")
+        time.sleep(0.5)
+        st.rerun()
+        return True
+
+    # Finished — clear the job and fold the outcome into the chat history
+    del st.session_state["ingest_job"]
+
+    if job["error"] is not None:
+        error_message = str(job["error"])
+        if job["kind"] == "create" and isinstance(job["error"], ValueError):
+            if "No readable content found" in error_message:
+                # One widget for the whole explanation instead of a
+                # websocket delta per line
+                msg = (
+                    "❌ Unable to create knowledge base: The uploaded files contain no readable text.\n\n"
+                    "Possible causes:\n"
+                    "• Image-only PDFs with poor quality images that OCR cannot process\n"
+                    "• Empty or corrupted files\n"
+                    "• Files in unsupported formats\n"
+                    "• Very small files with insufficient content"
+                )
+                if "Failed files:" in error_message:
+                    failed_part = error_message.split("Failed files:")[1].strip()
+                    msg += f"\n• Failed files: {failed_part}"
+                st.error(msg)
+            else:
+                st.error(f"❌ Failed to create knowledge base: {error_message}")
+
+            chat_history.append(
+                AIMessage(content=f"❌ Failed to create knowledge base: {error_message}")
+            )
+        else:
+            st.error("❌ Some files couldn't be processed. They may be empty, corrupted, or in an unsupported format.")
+        return False
+
+    failed_files = job["result"]
+    successful_files = [n for n in job["file_names"] if n not in failed_files]
+
+    if job["kind"] == "create":
+        st.session_state.kb_initialized = True
+        if successful_files:
+            file_list = ", ".join(successful_files)
+            chat_history.append(
+                AIMessage(content=f"✅ Knowledge Base created successfully with: {file_list}")
+            )
+    else:
+        if successful_files:
+            file_list = ", ".join(successful_files)
+            chat_history.append(
+                AIMessage(content=f"✅ Successfully added to Knowledge Base: {file_list}")
+            )
+        # Fresh uploader so the just-ingested files are cleared from it
+        st.session_state.uploader_key = st.session_state.get("uploader_key", 0) + 1
+
+    if failed_files:
+        failed_list = ", ".join(failed_files)
+        chat_history.append(
+            AIMessage(content=f"⚠️ Some files couldn't be processed: {failed_list}")
+        )
+
+    rerun_app()  # chat panel and layout must pick up the new state
+    return False
+
+
+def _upload_digest(chat_engine, uploaded_file) -> str:
+    """
+    Content digest of an upload, memoized by (name, size) for the session.
+
+    Streamlit re-runs handlers with the same UploadedFile objects, so the
+    memo avoids re-reading every byte of large files on each rerun. The
+    memo lives in session state and is dropped with the rest of it on
+    knowledge base reset.
+    """
+    memo = st.session_state.setdefault("upload_hash_memo", {})
+    key = (uploaded_file.name, uploaded_file.size)
+    if key not in memo:
+        memo[key] = chat_engine.knowledge_base.digest_uploaded_file(uploaded_file)
+    return memo[key]
+
 
 def render_welcome_message():
     """Render the welcome message for new users."""
@@ -30,72 +159,39 @@ def create_knowledge_base_handler(chat_engine, chat_history: List):
     def handle_create_kb():
         """Handle the creation of initial knowledge base."""
         initial_uploaded_files = st.session_state.get("initial_uploader", [])
-        
-        if not initial_uploaded_files:
+
+        if not initial_uploaded_files or st.session_state.get("ingest_job"):
             return
-            
+
         try:
-            # Remove duplicates from initial upload
-            unique_files = {}
-            duplicate_count = 0
-            
+            # Remove duplicates from initial upload — by name, and by
+            # content digest so identical bytes under two names aren't
+            # embedded twice. First occurrence wins; name-dupes are
+            # skipped before paying for a digest.
+            seen_names = set()
+            seen_digests = set()
+            unique_files = []
+
             for uploaded_file in initial_uploaded_files:
-                if uploaded_file.name not in unique_files:
-                    unique_files[uploaded_file.name] = uploaded_file
-                else:
-                    duplicate_count += 1
-            
+                if uploaded_file.name in seen_names:
+                    continue
+                digest = _upload_digest(chat_engine, uploaded_file)
+                if digest in seen_digests:
+                    continue
+                seen_names.add(uploaded_file.name)
+                seen_digests.add(digest)
+                unique_files.append(uploaded_file)
+
+            duplicate_count = len(initial_uploaded_files) - len(unique_files)
+
             if duplicate_count > 0:
                 st.warning(f"⚠️ Removed {duplicate_count} duplicate file(s) from your selection")
             
 
-            # Create knowledge base directly from uploaded files
+            # Kick ingestion off in the background; render_ingest_status
+            # polls the job and reports the outcome (including errors)
             if unique_files:
-                try:
-                    with st.spinner(f"Creating knowledge base from {len(unique_files)} document(s)...\n(This may take a moment for large files)"):
-                        failed_files = chat_engine.create_and_save(list(unique_files.values()))
-                    
-                    st.session_state.kb_initialized = True
-                    
-                    # Success message
-                    successful_files = [f.name for f in unique_files.values() if f.name not in failed_files]
-                    if successful_files:
-                        file_list = ", ".join(successful_files)
-                        chat_history.append(
-                            AIMessage(content=f"✅ Knowledge Base created successfully with: {file_list}")
-                        )
-                    
-                    # Show failed files if any
-                    if failed_files:
-                        failed_list = ", ".join(failed_files)
-                        chat_history.append(
-                            AIMessage(content=f"⚠️ Some files couldn't be processed: {failed_list}")
-                        )
-                    
-                except ValueError as ve:
-                    # Handle specific errors from create_and_save
-                    error_message = str(ve)
-                    if "No readable content found" in error_message:
-                        st.error("❌ Unable to create knowledge base: The uploaded files contain no readable text.")
-                        st.error("Possible causes:")
-                        st.error("• Image-only PDFs with poor quality images that OCR cannot process")
-                        st.error("• Empty or corrupted files") 
-                        st.error("• Files in unsupported formats")
-                        st.error("• Very small files with insufficient content")
-                        
-                        # Show which files failed if available
-                        if "Failed files:" in error_message:
-                            failed_part = error_message.split("Failed files:")[1].strip()
-                            st.error(f"• Failed files: {failed_part}")
-                    else:
-                        st.error(f"❌ Failed to create knowledge base: {error_message}")
-                        
-                    # Add chat message for failed creation
-                    chat_history.append(
-                        AIMessage(content=f"❌ Failed to create knowledge base: {error_message}")
-                    )
-                except Exception as e:
-                    st.error("❌ An unexpected error occurred while creating the knowledge base. Please try again.")
+                _start_ingest_job("create", chat_engine.create_and_save, unique_files)
             else:
                 st.error("❌ No valid files could be processed.")
                 
@@ -129,54 +225,45 @@ def create_add_documents_handler(chat_engine, chat_history: List):
         # Get the current uploader key to access the right session state
         current_key = f"new_files_uploader_{st.session_state.uploader_key}"
         uploaded_files = st.session_state.get(current_key, [])
-        
-        if not uploaded_files:
+
+        if not uploaded_files or st.session_state.get("ingest_job"):
             return
         
         try:
-            # Check for duplicates
-            existing_files = set(chat_engine.file_names)
+            # Check for duplicates: by name, then by content digest so a
+            # renamed copy of an ingested file skips the embedding pipeline
+            existing_files = chat_engine.file_names_set
+            knowledge_base = chat_engine.knowledge_base
+
+            # Partition by name first (cheap frozenset probes in listcomp
+            # opcodes), then digest only the remaining candidates
+            duplicate_files = [
+                f.name for f in uploaded_files if f.name in existing_files
+            ]
+            candidates = [
+                f for f in uploaded_files if f.name not in existing_files
+            ]
+
             files_to_add = []
-            duplicate_files = []
-            
-            for uploaded_file in uploaded_files:
-                if uploaded_file.name in existing_files:
-                    duplicate_files.append(uploaded_file.name)
+            for uploaded_file in candidates:
+                if knowledge_base.has_content_digest(
+                        _upload_digest(chat_engine, uploaded_file)):
+                    duplicate_files.append(f"{uploaded_file.name} (identical content)")
                 else:
                     files_to_add.append(uploaded_file)
             
-            # Show duplicate warnings
+            # One aggregated warning instead of a widget per duplicate
             if duplicate_files:
-                for duplicate_file in duplicate_files:
-                    st.warning(f"📁 {duplicate_file} is already in the knowledge base")
+                st.warning(
+                    "📁 Already in the knowledge base: "
+                    + ", ".join(duplicate_files)
+                )
             
-            # Process new files if any
+            # Kick ingestion off in the background; render_ingest_status
+            # polls the job, reports the outcome, and rotates the uploader
             if files_to_add:
-                try:
-                    with st.spinner(f"Adding {len(files_to_add)} new document(s)..."):
-                        failed_files = chat_engine.add_documents(files_to_add)
-                    
-                    # Success message for successfully added files
-                    successful_files = [f.name for f in files_to_add if f.name not in failed_files]
-                    if successful_files:
-                        file_list = ", ".join(successful_files)
-                        chat_history.append(
-                            AIMessage(content=f"✅ Successfully added to Knowledge Base: {file_list}")
-                        )
-                    
-                    # Show failed files if any
-                    if failed_files:
-                        failed_list = ", ".join(failed_files)
-                        chat_history.append(
-                            AIMessage(content=f"⚠️ Some files couldn't be processed: {failed_list}")
-                        )
-                    
-                    # Increment uploader key to create a new uploader (effectively clearing it)
-                    st.session_state.uploader_key += 1
-                    
-                except Exception as e:
-                    st.error("❌ Some files couldn't be processed. They may be empty, corrupted, or in an unsupported format.")
-            
+                _start_ingest_job("add", chat_engine.add_documents, files_to_add)
+
             elif not duplicate_files:
                 st.info("No files were selected for upload.")
                 
@@ -185,14 +272,34 @@ def create_add_documents_handler(chat_engine, chat_history: List):
     
     return handle_add_documents
 
+
+def _get_add_documents_handler(chat_engine, chat_history: List):
+    """
+    Reuse one handler closure across reruns.
+
+    The handler reads the uploader contents from session state by key, so
+    a cached closure never goes stale as long as it captured the same
+    engine and history objects; a knowledge base reset clears session
+    state and drops the memo with everything else.
+    """
+    cached = st.session_state.get("_add_docs_handler")
+    if (cached is None
+            or cached[0] is not chat_engine
+            or cached[1] is not chat_history):
+        handler = create_add_documents_handler(chat_engine, chat_history)
+        st.session_state["_add_docs_handler"] = (chat_engine, chat_history, handler)
+        return handler
+    return cached[2]
+
+
 def render_add_documents_section(chat_engine, chat_history: List):
     """Render the section for adding new documents."""
     st.markdown("### Add More Documents")
-    
+
     # Use a dynamic key to force recreation of file uploader when needed
     if "uploader_key" not in st.session_state:
         st.session_state.uploader_key = 0
-        
+
     new_uploaded_files = st.file_uploader(
         "Upload more documents",
         type=["pdf", "docx", "txt"],
@@ -200,8 +307,8 @@ def render_add_documents_section(chat_engine, chat_history: List):
         key=f"new_files_uploader_{st.session_state.uploader_key}",
         label_visibility="collapsed"
     )
-    
-    handle_add_documents = create_add_documents_handler(chat_engine, chat_history)
+
+    handle_add_documents = _get_add_documents_handler(chat_engine, chat_history)
     
     st.button(
         "Add to Knowledge Base", 
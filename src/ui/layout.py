@@ -16,44 +16,79 @@ Future Implementation:
 
 import streamlit as st
 from .components.chat import render_chat_messages, handle_chat_input
-from .components.upload import render_initial_upload_section, render_add_documents_section
+from .components.upload import (
+    render_initial_upload_section,
+    render_add_documents_section,
+    render_ingest_status,
+)
 from .components.knowledge_base import render_knowledge_base_section, render_reset_section
 from ..core.session import ensure_session_state, get_chat_engine, get_chat_history, is_kb_initialized
 
+# Fragments scope widget-triggered reruns to their own subtree, so typing
+# in the sidebar doesn't re-render the chat history and vice versa.
+# Cross-panel changes use rerun_app() to force a full rerun explicitly.
+if hasattr(st, "fragment"):
+    _fragment = st.fragment
+else:
+    def _fragment(func):
+        # Streamlit < 1.33: no fragments, every rerun is app-wide anyway
+        return func
+
+
+@_fragment
+def _sidebar_panel(chat_engine, chat_history):
+    """Sidebar subtree: KB management, uploads, and ingestion status."""
+    # Background ingestion status (started by the upload handlers);
+    # polls and reruns until the worker thread finishes
+    render_ingest_status(chat_engine, chat_history)
+
+    if is_kb_initialized():
+        # --- KB EXISTS: SHOW MANAGEMENT UI ---
+        render_knowledge_base_section(chat_engine, chat_history)
+        st.divider()
+        render_add_documents_section(chat_engine, chat_history)
+
+        # Reset button - only show when there's a KB to reset
+        st.divider()
+        render_reset_section()
+    else:
+        # --- NO KB: SHOW CREATE_KB_UI ---
+        render_initial_upload_section(chat_engine, chat_history)
+
+
+@_fragment
+def _chat_panel(chat_engine, chat_history):
+    """Main-panel subtree: message history and input box."""
+    render_chat_messages(chat_history)
+
+    # User input - will be adapted for layer-specific functionality
+    if prompt := st.chat_input("Ask me anything about your documents..."):
+        handle_chat_input(prompt, chat_engine, chat_history)
+
+
 def render_sidebar():
     """
     Render the complete sidebar layout.
-    
+
     Current: Single KB management
     Future: Will include layer navigation and KB selection
     """
     with st.sidebar:
         # Ensure session state is properly initialized
         ensure_session_state()
-        
+
         chat_engine = get_chat_engine()
         chat_history = get_chat_history()
-        
+
         # FUTURE: Layer navigation will be added here
         # render_layer_navigation()
-        
-        if is_kb_initialized():
-            # --- KB EXISTS: SHOW MANAGEMENT UI ---
-            render_knowledge_base_section(chat_engine, chat_history)
-            st.divider()
-            render_add_documents_section(chat_engine, chat_history)
-            
-            # Reset button - only show when there's a KB to reset
-            st.divider()
-            render_reset_section()
-        else:
-            # --- NO KB: SHOW CREATE_KB_UI ---
-            render_initial_upload_section(chat_engine, chat_history)
+
+        _sidebar_panel(chat_engine, chat_history)
 
 def render_main_chat():
     """
     Render the main chat interface.
-    
+
     Current: Direct chat with single KB
     Future: Will adapt based on current layer (Hub vs Detail)
     """
@@ -62,18 +97,13 @@ def render_main_chat():
     #     render_hub_interface()
     # else:
     #     render_kb_detail_interface()
-    
+
     st.title("🤖 AI Office Assistant")
-    
+
     chat_history = get_chat_history()
     chat_engine = get_chat_engine()
-    
-    # Display chat messages
-    render_chat_messages(chat_history)
 
-    # User input - will be adapted for layer-specific functionality
-    if prompt := st.chat_input("Ask me anything about your documents..."):
-        handle_chat_input(prompt, chat_engine, chat_history)
+    _chat_panel(chat_engine, chat_history)
 
 # FUTURE: Layer-specific rendering functions
 def render_hub_interface():
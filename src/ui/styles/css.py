@@ -5,55 +5,116 @@ This module contains all custom CSS styling definitions for the application.
 Separated for better maintainability and future theming support.
 """
 
+import re
+
 import streamlit as st
 
+# Selectors key on stable [data-testid] attributes rather than generated
+# st-emotion-cache-* class names (which change between Streamlit releases)
+# and avoid :has(), whose matching cost grows with the message list.
+# User messages render through st.text, AI messages through st.markdown,
+# so the inner content blocks are distinguishable without parent selectors.
+_CSS_RAW = """
+    /* Main container styling */
+    .main {
+        background-color: #f0f2f6;
+    }
+
+    /* Chat bubbles styling (AI/default) */
+    [data-testid="stChatMessage"] {
+        border-radius: 20px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+        background-color: #ffffff;
+    }
+
+    /* User message content (plain text block) */
+    [data-testid="stChatMessage"] [data-testid="stText"] {
+        background-color: #dcf8c6;
+        border-radius: 10px;
+        padding: 0.5rem;
+    }
+
+    /* Pre-rendered chat bubbles (single-flush history path) */
+    .chat-msg {
+        display: flex;
+        gap: 0.5rem;
+        border-radius: 20px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+        background-color: #ffffff;
+    }
+
+    .chat-msg .avatar {
+        font-size: 1.5rem;
+    }
+
+    .chat-msg .body {
+        flex: 1;
+        min-width: 0;
+    }
+
+    .chat-msg.user .body {
+        background-color: #dcf8c6;
+        border-radius: 10px;
+        padding: 0.5rem;
+        white-space: pre-wrap;
+    }
+
+    /* Hide Streamlit branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+
+    /* Center align the text in st.info */
+    .stAlert {
+        text-align: center;
+    }
+    """
+
+
+def _minify(css: str) -> str:
+    """Strip comments and collapse whitespace; runs once at import."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r" ?([{};:,]) ?", r"\1", css)
+    return css.strip()
+
+
+# Built once at import; Streamlit reruns the script per interaction and a
+# module constant avoids re-allocating the block every time.
+_CUSTOM_CSS = "<style>" + _minify(_CSS_RAW) + "</style>"
+
+# Served from ./static when static serving is enabled; the browser caches
+# the stylesheet, so reruns only carry this one-line link over the websocket
+_CSS_LINK = '<link rel="stylesheet" href="/app/static/custom.css">'
+
+
+def _emit_html(html: str):
+    """
+    Emit raw HTML, skipping the markdown pipeline where possible.
+
+    st.html (Streamlit >= 1.36) injects into the page directly; older
+    versions fall back to st.markdown. components.html is not an option
+    for styles — it renders into an iframe, where CSS cannot reach the
+    host page.
+    """
+    if hasattr(st, "html"):
+        st.html(html)
+    else:
+        st.markdown(html, unsafe_allow_html=True)
+
+
 def inject_custom_css():
     """Inject custom CSS for styling the application."""
-    st.markdown("""
-    <style>
-        /* Main container styling */
-        .main {
-            background-color: #f0f2f6;
-        }
-        
-        /* Chat bubbles styling */
-        .st-emotion-cache-1c7y2kd {
-            border-radius: 20px;
-            padding: 1rem;
-            margin-bottom: 1rem;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        
-        /* User message */
-        .st-emotion-cache-1c7y2kd[data-testid="stChatMessage"]:has(.st-emotion-cache-1f1d6gn) {
-            background-color: #dcf8c6;
-        }
-        
-        /* AI message */
-        .st-emotion-cache-1c7y2kd[data-testid="stChatMessage"]:not(:has(.st-emotion-cache-1f1d6gn)) {
-            background-color: #ffffff;
-        }
-        
-        /* Hide Streamlit branding */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        
-        /* Center align the text in st.info */
-        .stAlert {
-            text-align: center;
-        }
-        
-        /* Future: Layer navigation styles will be added here */
-        .layer-nav-container {
-            /* Placeholder for future layer navigation */
-        }
-        
-        .kb-hub-card {
-            /* Placeholder for future KB hub cards */
-        }
-        
-        .breadcrumb-nav {
-            /* Placeholder for future breadcrumb navigation */
-        }
-    </style>
-    """, unsafe_allow_html=True) 
\ No newline at end of file
+    try:
+        static_serving = st.config.get_option("server.enableStaticServing")
+    except Exception:
+        static_serving = False
+
+    if static_serving:
+        _emit_html(_CSS_LINK)
+    else:
+        # Fallback: inline the minified block as before
+        _emit_html(_CUSTOM_CSS)